@@ -0,0 +1,44 @@
+"""
+Times the conventional commit header parser on adversarial long messages and
+compares it to the regular expression it replaced.
+
+    python -m benchmarks.conventional_commits
+"""
+import re
+import timeit
+
+from heuristics.util.conventional import parse, parse_header
+
+OLD_REGEX = re.compile(
+    r"\A(((Initial commit)|(Merge [^\r\n]+)|"
+    r"((build|chore|ci|docs|feat|fix|perf|refactor|revert|style|test)(\(\w+\))?!?: [^\r\n]+"
+    r"((\r|\n|\r\n)((\r|\n|\r\n)[^\r\n]+)+)*"
+    r")"
+    r")(\r|\n|\r\n)?)"
+)
+
+
+def adversarial_messages(n: int):
+    yield "paragraphs", "fix: x" + "\n\nline" * n
+    yield "crlf paragraphs", "fix: x" + "\r\n\r\nline" * n
+    yield "line breaks", "fix: x" + "\r\n" * n + "y"
+    yield "long line", "fix: x\n\n" + "a" * (50 * n)
+    yield "long header", "fix: " + "a" * (50 * n)
+    yield "no header", "a" * (50 * n) + ": x"
+
+
+def main() -> None:
+    for n in (1_000, 10_000, 100_000):
+        print(f"n = {n}")
+        for name, message in adversarial_messages(n):
+            old = min(timeit.repeat(lambda: OLD_REGEX.match(message), number=1))
+            header = min(timeit.repeat(lambda: parse_header(message), number=1))
+            full = min(timeit.repeat(lambda: parse(message), number=1))
+            print(
+                f"  {name:16} regex {old * 1e3:9.3f} ms"
+                f"  header {header * 1e3:9.3f} ms  full parse {full * 1e3:9.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
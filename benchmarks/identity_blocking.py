@@ -0,0 +1,49 @@
+"""
+Reports how many of the identity pairs labeled as Match by the identity
+heuristics are kept by candidate blocking, on a sample of identities given as
+JSON lines of identity documents (`{"names": [...], "emails": [...]}`).
+
+    python -m benchmarks.identity_blocking identities.jsonl [max_block_size]
+"""
+import importlib
+import json
+import pkgutil
+import sys
+import time
+
+from bohrapi.artifacts.identity import Identity
+
+import heuristics.identities
+from heuristics.util.blocking import Blocker, blocking_recall
+
+
+def identity_heuristics():
+    for module_info in pkgutil.iter_modules(heuristics.identities.__path__):
+        module = importlib.import_module(
+            f"{heuristics.identities.__name__}.{module_info.name}"
+        )
+        # each module defines a heuristic named after it
+        yield getattr(module, module_info.name)
+
+
+def main() -> None:
+    path = sys.argv[1]
+    max_block_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    with open(path) as f:
+        identities = [Identity(json.loads(line)) for line in f]
+    start = time.perf_counter()
+    blocker = Blocker(identities, max_block_size=max_block_size)
+    candidates = sum(1 for _ in blocker.candidates())
+    elapsed = time.perf_counter() - start
+    print(f"{len(identities)} identities, {candidates} candidates in {elapsed:.2f}s")
+    print(f"{blocker.skipped_blocks} blocks larger than {max_block_size} skipped")
+    report = blocking_recall(blocker, list(identity_heuristics()))
+    print(
+        f"cross product {report.pairs}, Match pairs {report.matches}, "
+        f"found {report.found}: recall {report.recall:.4f}, "
+        f"pairs not scored {report.reduction:.2%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.ngrams import message_ngrams
+
 
 @Heuristic(Commit)
 def add_keyword(commit: Commit) -> Optional[OneOrManyLabels]:
@@ -15,6 +17,6 @@ def add_keyword(commit: Commit) -> Optional[OneOrManyLabels]:
     >>> add_keyword(Commit({"message": "add unit-test"}))
     CommitLabel.NonBugFix
     """
-    if commit.message.match_ngrams(["add"]):
+    if message_ngrams.match(commit, ["add"]):
         return CommitLabel.NonBugFix
     return None
@@ -5,8 +5,10 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.tooloutputs import ToolFlag, has_flag
+
 
 @Heuristic(Commit)
 def bug_if_sstub(commit: Commit) -> Optional[OneOrManyLabels]:
-    if "mine_sstubs/head" in commit.raw_data and commit.raw_data["mine_sstubs/head"]:
+    if has_flag(commit, ToolFlag.SSTUB):
         return CommitLabel.BugFix
@@ -1,4 +1,3 @@
-import re
 from typing import Optional
 
 from bohrapi.artifacts import Commit
@@ -6,6 +5,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.conventional import parse_header
+
 example1 = """feat: allow provided config object to extend other configs
 
 BREAKING CHANGE: `extends` key in config file is now used for extending other config files
@@ -35,14 +36,6 @@ Reviewed-by: Z
 Refs #133
 """
 
-REGEX = re.compile(
-    r"\A(((Initial commit)|(Merge [^\r\n]+)|"
-    r"((build|chore|ci|docs|feat|fix|perf|refactor|revert|style|test)(\(\w+\))?!?: [^\r\n]+"
-    r"((\r|\n|\r\n)((\r|\n|\r\n)[^\r\n]+)+)*"
-    r")"
-    r")(\r|\n|\r\n)?)"
-)
-
 
 @Heuristic(Commit)
 def conventional_commit_regex(commit: Commit) -> Optional[OneOrManyLabels]:
@@ -60,10 +53,10 @@ def conventional_commit_regex(commit: Commit) -> Optional[OneOrManyLabels]:
     >>> conventional_commit_regex(Commit({"author": 'a', "repository": 'a', "_id": '1df23', "message": example6}))
     CommitLabel.BugFix
     """
-    m = REGEX.match(commit.message.raw)
-    if m is None:
+    header = parse_header(commit.message.raw)
+    if header is None:
         return None
-    type = m.groups()[5]
+    type = header.type
     if type == "fix":
         return CommitLabel.BugFix
     elif type == "feat":
@@ -5,11 +5,9 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.filestats import file_stats, many_lines_changed
+
 
 @Heuristic(Commit)
 def buggless_if_many_lines_changed(commit: Commit) -> Optional[OneOrManyLabels]:
-    sum = 0
-    for file in commit.commit_files:
-        if file.changes:
-            sum += len(file.changes)
-    return CommitLabel.NonBugFix if sum > 16000 else None
\ No newline at end of file
+    return CommitLabel.NonBugFix if many_lines_changed(file_stats(commit)) else None
@@ -5,7 +5,9 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.filestats import file_stats, one_file
+
 
 @Heuristic(Commit)
 def buggless_one_file(commit: Commit) -> Optional[OneOrManyLabels]:
-    return CommitLabel.NonBugFix if len(commit.commit_files) == 1 else None
+    return CommitLabel.NonBugFix if one_file(file_stats(commit)) else None
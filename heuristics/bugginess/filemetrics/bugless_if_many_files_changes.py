@@ -5,10 +5,12 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.filestats import file_stats, many_files
+
 
 @Heuristic(Commit)
 def bugless_if_many_files_changes(commit: Commit) -> Optional[OneOrManyLabels]:
-    if len(commit.commit_files) > 15:
+    if many_files(file_stats(commit)):
         return CommitLabel.NonBugFix
     else:
         return None
@@ -2,20 +2,12 @@ from typing import Optional
 
 from bohrapi.artifacts import Commit
 from bohrapi.core import Heuristic
-from bohrapi.util.extensiontypes import code_extensions, passive_code_extensions
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.filestats import file_stats, no_code_files
+
 
 @Heuristic(Commit)
 def bugless_if_not_code_files(commit: Commit) -> Optional[OneOrManyLabels]:
-    file_found = False
-    for file in commit.commit_files:
-        if isinstance(file.filename, float):
-            continue  # TODO filename is NaN if it's not given <- needs to be fixed!
-        if file.filename.split(".")[-1] in [*code_extensions, *passive_code_extensions]:
-            # TODO move filetype logic to CommitFile artifact?
-            return None
-        else:
-            file_found = True
-    return CommitLabel.NonBugFix if file_found else None
+    return CommitLabel.NonBugFix if no_code_files(file_stats(commit)) else None
@@ -5,13 +5,9 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.filestats import file_stats, no_modified_files
+
 
 @Heuristic(Commit)
 def no_files_have_modified_status(commit: Commit) -> Optional[OneOrManyLabels]:
-    if len(commit.commit_files) == 0 or commit.commit_files[0].status == "empty":
-        return None
-    for file in commit.commit_files:
-        if file.status == "modified":
-            return None
-    return CommitLabel.NonBugFix
-
+    return CommitLabel.NonBugFix if no_modified_files(file_stats(commit)) else None
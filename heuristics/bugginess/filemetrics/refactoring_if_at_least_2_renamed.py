@@ -5,11 +5,9 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.filestats import file_stats, many_renamed_files
+
 
 @Heuristic(Commit)
 def refactoring_if_at_least_2_renamed(commit: Commit) -> Optional[OneOrManyLabels]:
-    renamed_count = 0
-    for file in commit.commit_files:
-        if file.status == "renamed":
-            renamed_count += 1
-    return CommitLabel.Refactoring if renamed_count >= 2 else None
+    return CommitLabel.Refactoring if many_renamed_files(file_stats(commit)) else None
@@ -5,6 +5,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.ngrams import message_ngrams
+
 
 @Heuristic(Commit)
 def fix_keyword(commit: Commit) -> Optional[OneOrManyLabels]:
@@ -16,6 +18,6 @@ def fix_keyword(commit: Commit) -> Optional[OneOrManyLabels]:
     >>> fix_keyword(Commit({"message": "fix unit-test"}))
     CommitLabel.BugFix
     """
-    if commit.message.match_ngrams(["fix"]):
+    if message_ngrams.match(commit, ["fix"]):
         return CommitLabel.BugFix
     return None
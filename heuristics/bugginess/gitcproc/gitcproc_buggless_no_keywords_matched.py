@@ -5,10 +5,10 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.ngrams import message_ngrams
 
-@Heuristic(Commit)
-def gitcproc_buggless_no_keywords_matched(commit: Commit) -> Optional[OneOrManyLabels]:
-    for ngram in [
+GITCPROC_KEYWORDS = frozenset(
+    [
         "bug",
         "fix",
         "issu",
@@ -18,7 +18,12 @@ def gitcproc_buggless_no_keywords_matched(commit: Commit) -> Optional[OneOrManyL
         "defect",
         "flaw",
         "type",
-    ]:
-        if commit.message.match_ngrams({ngram}):
-            return None
+    ]
+)
+
+
+@Heuristic(Commit)
+def gitcproc_buggless_no_keywords_matched(commit: Commit) -> Optional[OneOrManyLabels]:
+    if message_ngrams.match(commit, GITCPROC_KEYWORDS):
+        return None
     return CommitLabel.NonBugFix
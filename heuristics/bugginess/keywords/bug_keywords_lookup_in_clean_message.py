@@ -6,6 +6,8 @@ from bohrapi.util.misc import NgramSet
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.ngrams import clean_message_ngrams
+
 
 @KeywordHeuristics(
     Commit,
@@ -67,6 +69,6 @@ def bug_keywords_lookup_in_clean_message(
     >>> res is None
     True
     """
-    if commit.clean_message.match_ngrams(keywords):
+    if clean_message_ngrams.match(commit, keywords):
         return CommitLabel.BugFix
     return None
@@ -6,6 +6,8 @@ from bohrapi.util.misc import NgramSet
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.ngrams import message_ngrams
+
 
 @KeywordHeuristics(
     Commit,
@@ -61,6 +63,6 @@ from bohrlabels.labels import CommitLabel
 def bug_keywords_lookup_in_message(
     commit: Commit, keywords: NgramSet
 ) -> Optional[OneOrManyLabels]:
-    if commit.message.match_ngrams(keywords):
+    if message_ngrams.match(commit, keywords):
         return CommitLabel.BugFix
     return None
@@ -6,6 +6,8 @@ from bohrapi.util.misc import NgramSet
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.issues import issue_body_ngrams
+
 
 @KeywordHeuristics(
     Commit,
@@ -105,6 +107,6 @@ from bohrlabels.labels import CommitLabel
 def bugless_keywords_lookup_in_issue_body(
     commit: Commit, keywords: NgramSet
 ) -> Optional[OneOrManyLabels]:
-    if commit.issues_match_ngrams(keywords):
+    if issue_body_ngrams.match(commit, keywords):
         return CommitLabel.NonBugFix
     return None
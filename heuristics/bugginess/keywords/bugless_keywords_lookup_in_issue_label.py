@@ -6,6 +6,8 @@ from bohrapi.util.misc import NgramSet
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.issues import issue_label_ngrams
+
 
 @KeywordHeuristics(
     Commit,
@@ -15,6 +17,6 @@ from bohrlabels.labels import CommitLabel
 def bugless_keywords_lookup_in_issue_label(
     commit: Commit, keywords: NgramSet
 ) -> Optional[OneOrManyLabels]:
-    if commit.issues_match_label(keywords):
+    if issue_label_ngrams.match(commit, keywords):
         return CommitLabel.NonBugFix
     return None
@@ -6,6 +6,8 @@ from bohrapi.heuristictypes import KeywordHeuristics
 from bohrapi.util.misc import NgramSet
 from bohrlabels.core import OneOrManyLabels
 
+from heuristics.util.ngrams import message_ngrams
+
 
 @KeywordHeuristics(
     Commit,
@@ -19,6 +21,6 @@ from bohrlabels.core import OneOrManyLabels
 def concurrency_bug_keywords_in_message(
     commit: Commit, keywords: NgramSet
 ) -> Optional[OneOrManyLabels]:
-    if commit.message.match_ngrams(keywords):
+    if message_ngrams.match(commit, keywords):
         return l.CommitLabel.ConcurrencyBugFix
     return None
@@ -6,6 +6,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.regexes import message_regexes
+
 GITHUB_REF_RE = re.compile(r"gh(-|\s)\d+", flags=re.I)
 
 
@@ -21,4 +23,4 @@ def github_ref_in_message(commit: Commit) -> Optional[OneOrManyLabels]:
     >>> github_ref_in_message(Commit({"owner": "x", "repository": "y", "_id": "12afbc4564ba", "message": "GH123: wrong issue reference"})) is None
     True
     """
-    return CommitLabel.BugFix if GITHUB_REF_RE.search(commit.message.raw) else None
+    return CommitLabel.BugFix if message_regexes.search(commit, GITHUB_REF_RE) else None
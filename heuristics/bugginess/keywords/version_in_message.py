@@ -6,9 +6,11 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.regexes import message_regexes
+
 VERSION_RE = re.compile(r"v\d+.*", flags=re.I)
 
 
 @Heuristic(Commit)
 def version_in_message(commit: Commit) -> Optional[OneOrManyLabels]:
-    return CommitLabel.NonBugFix if VERSION_RE.search(commit.message.raw) else None
+    return CommitLabel.NonBugFix if message_regexes.search(commit, VERSION_RE) else None
@@ -5,13 +5,11 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.tooloutputs import ToolFlag, has_flag
+
 
 @Heuristic(Commit)
 def large_change(commit: Commit) -> Optional[OneOrManyLabels]:
-    if (
-        "bohr" in commit.raw_data
-        and "gt_512_codeberta_tokens" in commit.raw_data["bohr"]
-    ):
-        if commit.raw_data["bohr"]["gt_512_codeberta_tokens"]:
-            return CommitLabel.NonBugFix
+    if has_flag(commit, ToolFlag.GT_512_CODEBERTA_TOKENS):
+        return CommitLabel.NonBugFix
     return None
@@ -5,13 +5,13 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.tooloutputs import ToolFlag, has_flag
+
 
 @Heuristic(Commit)
 def small_change(commit: Commit) -> Optional[OneOrManyLabels]:
-    if (
-        "bohr" in commit.raw_data
-        and "gt_512_codeberta_tokens" in commit.raw_data["bohr"]
+    if has_flag(commit, ToolFlag.CODEBERTA_TOKENS_KNOWN) and not has_flag(
+        commit, ToolFlag.GT_512_CODEBERTA_TOKENS
     ):
-        if not commit.raw_data["bohr"]["gt_512_codeberta_tokens"]:
-            return CommitLabel.BugFix
+        return CommitLabel.BugFix
     return None
@@ -5,12 +5,10 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.tooloutputs import ToolFlag, has_flag
+
 
 @Heuristic(Commit)
 def commit_explorer_output_init(commit: Commit) -> Optional[OneOrManyLabels]:
-    if (
-        "special_commit_finder/0_1" in commit.raw_data
-        and "initial" in commit.raw_data["special_commit_finder/0_1"]
-        and commit.raw_data["special_commit_finder/0_1"]["initial"]
-    ):
+    if has_flag(commit, ToolFlag.INITIAL):
         return CommitLabel.InitialCommit
@@ -5,16 +5,12 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.refactorings import only_refactoring
+
 
 @Heuristic(Commit)
 def commit_explorer_output_refactoring_miner(
     commit: Commit,
 ) -> Optional[OneOrManyLabels]:
-    if "refactoring_miner/2_1_0" in commit.raw_data:
-        if commit.raw_data["refactoring_miner/2_1_0"]:
-            if commit.raw_data["refactoring_miner/2_1_0"]["status"] == "ok":
-                if len(commit.raw_data["refactoring_miner/2_1_0"]["refactorings"]) == 1:
-                    if commit.raw_data["refactoring_miner/2_1_0"]["refactorings"][0][
-                        "type"
-                    ] in ["Move Class"]:
-                        return CommitLabel.Refactoring
+    if only_refactoring(commit, "Move Class"):
+        return CommitLabel.Refactoring
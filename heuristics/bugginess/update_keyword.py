@@ -5,6 +5,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.ngrams import message_ngrams
+
 
 @Heuristic(Commit)
 def update_keyword(commit: Commit) -> Optional[OneOrManyLabels]:
@@ -16,6 +18,6 @@ def update_keyword(commit: Commit) -> Optional[OneOrManyLabels]:
     >>> update_keyword(Commit({"message": "update unit-test"}))
     CommitLabel.NonBugFix
     """
-    if commit.message.match_ngrams(["updat"]):
+    if message_ngrams.match(commit, ["updat"]):
         return CommitLabel.NonBugFix
     return None
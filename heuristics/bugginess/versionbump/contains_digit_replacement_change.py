@@ -1,4 +1,3 @@
-import re
 from typing import Optional
 
 from bohrapi.artifacts import Commit
@@ -6,16 +5,12 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
-VERSION_CHANGE_REGEX = re.compile(r"\.</eq><re>\d+<to>\d+</re>")
+from heuristics.util.changes import file_changes
 
 
 @Heuristic(Commit)
 def contains_digit_replacement_change(commit: Commit) -> Optional[OneOrManyLabels]:
-    """
-    >>> VERSION_CHANGE_REGEX.search("<eq>4.</eq><re>11<to>12</re>")
-    <re.Match object; span=(5, 28), match='.</eq><re>11<to>12</re>'>
-    """
     for file in commit.commit_files:
-        if file.changes is not None and VERSION_CHANGE_REGEX.search(file.changes):
+        if file.changes is not None and file_changes(commit, file).digit_replacement():
             return CommitLabel.VersionBump
     return None
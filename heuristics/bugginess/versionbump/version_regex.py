@@ -6,6 +6,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.regexes import message_regexes
+
 VERSION_REGEX = re.compile(r"v\d+\..*", flags=re.I)
 
 VERSION_CHANGE_REGEX = re.compile(r"\.</eq><re>\d+<to>\d+</re>")
@@ -13,4 +15,8 @@ VERSION_CHANGE_REGEX = re.compile(r"\.</eq><re>\d+<to>\d+</re>")
 
 @Heuristic(Commit)
 def version_regex(commit: Commit) -> Optional[OneOrManyLabels]:
-    return CommitLabel.VersionBump if VERSION_REGEX.search(commit.message.raw) else None
+    return (
+        CommitLabel.VersionBump
+        if message_regexes.search(commit, VERSION_REGEX)
+        else None
+    )
@@ -6,11 +6,15 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.regexes import message_regexes
+
 VERSION_REGEX2 = re.compile(r"\d-SNAPSHOT")
 
 
 @Heuristic(Commit)
 def version_regex2(commit: Commit) -> Optional[OneOrManyLabels]:
     return (
-        CommitLabel.VersionBump if VERSION_REGEX2.search(commit.message.raw) else None
+        CommitLabel.VersionBump
+        if message_regexes.search(commit, VERSION_REGEX2)
+        else None
     )
@@ -6,11 +6,15 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.regexes import message_regexes
+
 VERSION_REGEX3 = re.compile(r"-rc")
 
 
 @Heuristic(Commit)
 def version_regex3(commit: Commit) -> Optional[OneOrManyLabels]:
     return (
-        CommitLabel.VersionBump if VERSION_REGEX3.search(commit.message.raw) else None
+        CommitLabel.VersionBump
+        if message_regexes.search(commit, VERSION_REGEX3)
+        else None
     )
@@ -5,15 +5,18 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.changes import DEL, file_changes
+
 
 @Heuristic(Commit)
 def removed_fixme(commit: Commit) -> Optional[OneOrManyLabels]:
     for file in commit.commit_files:
-        for change in file.parsed_changes:
-            if (
-                change[0] == "del" and "FIXME" in change[1]
-            ):  # TODO check some papers on technical debt for the ways the mine SATD and conclusion drawn
-                return (
-                    CommitLabel.BugFix
-                )  # TODO looks like these things are removed not by bug fixes but rather by just removing FIXMEs and TODOs :)
+        if file.changes is None:
+            continue
+        if file_changes(commit, file).contains(
+            DEL, "FIXME"
+        ):  # TODO check some papers on technical debt for the ways the mine SATD and conclusion drawn
+            return (
+                CommitLabel.BugFix
+            )  # TODO looks like these things are removed not by bug fixes but rather by just removing FIXMEs and TODOs :)
     return None  # TODO Should we just create labels smth like SadtRemoval
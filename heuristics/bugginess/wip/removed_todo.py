@@ -5,13 +5,16 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import CommitLabel
 
+from heuristics.util.changes import DEL, file_changes
+
 
 @Heuristic(Commit)
 def removed_todo(commit: Commit) -> Optional[OneOrManyLabels]:
     for file in commit.commit_files:
-        for change in file.parsed_changes:
-            if change[0] == "del" and "TODO" in change[1]:
-                return (
-                    CommitLabel.Refactoring
-                )  # TODO not sure about this one, what about XXX?
+        if file.changes is None:
+            continue
+        if file_changes(commit, file).contains(DEL, "TODO"):
+            return (
+                CommitLabel.Refactoring
+            )  # TODO not sure about this one, what about XXX?
     return None
@@ -15,8 +15,10 @@ def same_emails_without_domain(
     MatchLabel.Match
     >>> same_emails_without_domain((Identity({"emails": ["a@a.com"]}), Identity({"emails": ["b@b.com"]}))) is None
     True
+    >>> same_emails_without_domain((Identity({}), Identity({}))) is None
+    True
     """
     name1 = identities[0].normalized_email
     name2 = identities[1].normalized_email
-    if name1 == name2:
+    if name1 is not None and name1 == name2:
         return MatchLabel.Match
@@ -5,6 +5,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import MatchLabel
 
+from heuristics.util.identityfeatures import name_features
+
 
 @Heuristic(Identity, Identity)
 def same_if_first_and_last_names_in_email(
@@ -21,17 +23,17 @@ def same_if_first_and_last_names_in_email(
     True
     """
     if (email := identities[0].email) is not None and (
-        name := identities[1].name
+        name := name_features(identities[1].name)
     ) is not None:
         pass
     elif (email := identities[1].email) is not None and (
-        name := identities[0].name
+        name := name_features(identities[0].name)
     ) is not None:
         pass
     else:
         return
 
-    if len(spl := name.split(" ")) >= 2:
-        if len(first_name := spl[0]) > 1 and len(last_name := spl[-1]) > 1:
+    if len(name.tokens) >= 2:
+        if len(first_name := name.first) > 1 and len(last_name := name.last) > 1:
             if first_name in email and last_name in email:
                 return MatchLabel.Match
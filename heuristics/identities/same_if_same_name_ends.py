@@ -5,6 +5,8 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import MatchLabel
 
+from heuristics.util.identityfeatures import name_features
+
 
 @Heuristic(Identity, Identity)
 def same_if_same_name_ends(
@@ -18,9 +20,9 @@ def same_if_same_name_ends(
     >>> not_same_if_only_first_names_match((Identity({}), Identity({}))) is None
     True
     """
-    name1 = identities[0].name
-    name2 = identities[1].name
+    name1 = name_features(identities[0].name)
+    name2 = name_features(identities[1].name)
     if name1 is not None and name2 is not None:
-        if len(spl1 := name1.split(" ")) != len(spl2 := name2.split(" ")):
-            if spl1[0] == spl2[0] and spl1[-1] == spl2[-1]:
+        if len(name1.tokens) != len(name2.tokens):
+            if name1.first == name2.first and name1.last == name2.last:
                 return MatchLabel.Match
@@ -1,11 +1,13 @@
 from typing import Optional, Tuple
 
-import Levenshtein
 from bohrapi.artifacts.identity import Identity
 from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import MatchLabel
 
+from heuristics.util.editdistance import similar
+from heuristics.util.identityfeatures import name_features
+
 
 @Heuristic(Identity, Identity)
 def same_if_short_relative_edit_dist_per_words(
@@ -21,20 +23,16 @@ def same_if_short_relative_edit_dist_per_words(
     >>> same_if_short_relative_edit_dist_per_words((Identity({}), Identity({}))) is None
     True
     """
-    name1 = identities[0].name
-    name2 = identities[1].name
+    name1 = name_features(identities[0].name)
+    name2 = name_features(identities[1].name)
     if name1 is not None and name2 is not None:
-        if len(spl1 := name1.split(" ")) >= 2 and len(spl2 := name2.split(" ")) >= 2:
-            distance1 = Levenshtein.distance(spl1[0], spl2[0])
-            distance2 = Levenshtein.distance(spl1[1], spl2[1])
-            max_length1 = max(len(spl1[0]), len(spl2[0]))
-            max_length2 = max(len(spl1[1]), len(spl2[1]))
+        if len(spl1 := name1.tokens) >= 2 and len(spl2 := name2.tokens) >= 2:
+            # both words are compared, so that empty words raise ZeroDivisionError
+            # whether or not the other words are similar
+            first_similar = similar(spl1[0], spl2[0], 0.6)
+            second_similar = similar(spl1[1], spl2[1], 0.6)
             return (
                 MatchLabel.Match
-                if min(
-                    (max_length1 - distance1) / max_length1,
-                    (max_length2 - distance2) / max_length2,
-                )
-                >= 0.6
+                if first_similar and second_similar
                 else MatchLabel.NoMatch
             )
@@ -5,10 +5,12 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import SnippetLabel
 
+from heuristics.util.methods import MANY_INDENTATION_LEVELS, indentation_depth
+
 
 @Heuristic(Method)
 def many_indentation_levels(method: Method) -> Optional[OneOrManyLabels]:
-    if method.max_depth > 5:
+    if indentation_depth.above(method, MANY_INDENTATION_LEVELS):
         return SnippetLabel.LongMethod
     else:
         return None
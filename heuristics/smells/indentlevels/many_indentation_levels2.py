@@ -5,10 +5,12 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import OneOrManyLabels
 from bohrlabels.labels import SnippetLabel
 
+from heuristics.util.methods import MANY_INDENTATION_LEVELS2, indentation_depth
+
 
 @Heuristic(Method)
 def many_indentation_levels2(method: Method) -> Optional[OneOrManyLabels]:
-    if method.max_depth > 6:
+    if indentation_depth.above(method, MANY_INDENTATION_LEVELS2):
         return SnippetLabel.LongMethod
     else:
         return None
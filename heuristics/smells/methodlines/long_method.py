@@ -5,10 +5,12 @@ from bohrapi.core import Heuristic
 from bohrlabels.core import Label
 from bohrlabels.labels import SnippetLabel
 
+from heuristics.util.methods import LONG_METHOD_LINES
+
 
 @Heuristic(Method)
 def long_method(method: Method) -> Optional[Label]:
-    if len(method.lines) > 30:
+    if len(method.lines) > LONG_METHOD_LINES:
         return SnippetLabel.LongMethod
     else:
         return None
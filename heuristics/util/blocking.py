@@ -0,0 +1,459 @@
+from functools import lru_cache
+from itertools import combinations
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from bohrlabels.labels import MatchLabel
+
+from heuristics.util.editdistance import max_distance
+from heuristics.util.identityfeatures import NameFeatures, name_features
+
+Pair = Tuple[int, int]
+KeyFunction = Callable[[Any], Iterable[Hashable]]
+
+
+class CrossKeys(NamedTuple):
+    """
+    Blocking keys that only pair identities across two sides: an identity
+    getting a key from `left` is paired with the identities getting the same key
+    from `right`, e.g. the q-grams of names with those of emails, and two emails
+    sharing a q-gram do not become a candidate pair.
+    """
+
+    left: KeyFunction
+    right: KeyFunction
+
+
+BlockingKeys = Union[KeyFunction, CrossKeys]
+
+
+def qgrams(text: str, q: int = 3) -> Set[str]:
+    """
+    >>> sorted(qgrams("babii"))
+    ['abi', 'bab', 'bii']
+    >>> qgrams("hb")
+    set()
+    """
+    return {text[i : i + q] for i in range(len(text) - q + 1)}
+
+
+def name_tokens(identity: Any) -> Sequence[str]:
+    features = name_features(identity.name)
+    return () if features is None else features.tokens
+
+
+def exact_name(identity: Any) -> Iterable[Hashable]:
+    """Identical names (`same_if_same_names`)."""
+    return [] if identity.name is None else [identity.name]
+
+
+def normalized_email(identity: Any) -> Iterable[Hashable]:
+    """Identical normalized emails (`same_emails_without_domain`)."""
+    email = identity.normalized_email
+    return [] if email is None else [email]
+
+
+def first_and_last_token(identity: Any) -> Iterable[Hashable]:
+    """Same first and last name token (`same_if_same_name_ends`)."""
+    tokens = name_tokens(identity)
+    return [(tokens[0], tokens[-1])] if len(tokens) >= 2 else []
+
+
+def name_qgrams(identity: Any) -> Iterable[Hashable]:
+    """
+    Q-grams of the whole name, shared by names that are close in edit distance or
+    contain one another.
+    """
+    name = identity.name
+    return [] if name is None else qgrams(name.lower())
+
+
+def name_token_qgrams(identity: Any) -> Iterable[Hashable]:
+    """
+    Q-grams of the lowercase name tokens. If both the first and the last token
+    are too short to have q-grams, the tokens themselves, found among the
+    2-grams of `email_qgrams`.
+
+    >>> from types import SimpleNamespace
+    >>> sorted(name_token_qgrams(SimpleNamespace(name="Jo Li"))), sorted(name_token_qgrams(SimpleNamespace(name="Jo Lim")))
+    (['jo', 'li'], ['lim'])
+    """
+    keys = set()
+    for token in name_tokens(identity):
+        keys |= qgrams(token.lower())
+    name = name_features(identity.name)
+    if name is not None and len(name.tokens) >= 2:
+        first, last = name.first.lower(), name.last.lower()
+        if len(first) < 3 and len(last) < 3:
+            keys |= {token for token in (first, last) if len(token) == 2}
+    return keys
+
+
+def email_qgrams(identity: Any) -> Iterable[Hashable]:
+    """3-grams and 2-grams of the lowercase email, domain included."""
+    email = identity.email
+    if email is None:
+        return set()
+    email = email.lower()
+    return qgrams(email) | qgrams(email, 2)
+
+
+# The name-in-email heuristics look for the name tokens of one identity in the
+# whole email of the other one (`same_if_*first_and_last_names_in_email`)
+name_email_qgrams = CrossKeys(name_token_qgrams, email_qgrams)
+
+
+@lru_cache(maxsize=None)
+def deletion_depth(length: int, ratio: float = 0.8, q: int = 3) -> int:
+    """
+    Number of deletions after which a name of `length` shares a string with every
+    name it is `similar` to at `ratio` but that may share none of its q-grams. Two
+    strings at edit distance d share at least `shorter length - q + 1 - q * d`
+    q-grams, so this only concerns short names.
+
+    >>> {length: deletion_depth(length) for length in range(1, 40) if deletion_depth(length)}
+    {4: 1, 5: 1, 6: 1, 8: 2, 10: 2}
+    """
+    depth = 0
+    for other in range(1, 2 * length + 3):
+        distance = max_distance(max(length, other), ratio)
+        if distance < 1 or abs(length - other) > distance:
+            continue
+        if min(length, other) - q + 1 - q * distance <= 0:
+            depth = max(depth, distance)
+    return depth
+
+
+def name_deletions(identity: Any) -> Iterable[Hashable]:
+    """
+    Deletion neighbourhood of the lowercase name, of `deletion_depth` for its
+    length: names at edit distance d share a string obtained by deleting d
+    characters from each, so short names close in edit distance but without a
+    common q-gram, e.g. "Marko" and "Maxko", share a block
+    (`same_if_short_relative_edit_distance`).
+
+    >>> from types import SimpleNamespace
+    >>> set(name_deletions(SimpleNamespace(name="Marko"))) & set(name_deletions(SimpleNamespace(name="Maxko")))
+    {'mako'}
+    """
+    name = identity.name
+    if name is None:
+        return set()
+    name = name.lower()
+    keys = set()
+    for deleted in range(deletion_depth(len(name)) + 1):
+        for positions in combinations(range(len(name)), deleted):
+            keys.add("".join(c for i, c in enumerate(name) if i not in positions))
+    return keys
+
+
+IDENTITY_BLOCKING_KEYS: Sequence[BlockingKeys] = (
+    exact_name,
+    normalized_email,
+    first_and_last_token,
+    name_qgrams,
+    name_email_qgrams,
+    name_deletions,
+)
+
+
+def hash_join(
+    identities: Sequence[Any], key: Callable[[Any], Optional[Hashable]]
+) -> Iterator[Pair]:
+    """
+    Pairs (i, j), i < j, of identities with the same non-None `key`, found by
+    grouping the identities by key instead of comparing every pair.
+
+    >>> from types import SimpleNamespace
+    >>> identities = [SimpleNamespace(name=name) for name in ["Hlib Babii", None, "Hlib Babii", "hlib", None, "Hlib Babii"]]
+    >>> list(hash_join(identities, attrgetter("name")))
+    [(0, 2), (0, 5), (2, 5)]
+    """
+    groups: Dict[Hashable, List[int]] = {}
+    for i, identity in enumerate(identities):
+        value = key(identity)
+        if value is not None:
+            groups.setdefault(value, []).append(i)
+    for group in groups.values():
+        yield from combinations(group, 2)
+
+
+# heuristics labeling a pair as Match exactly if a key of both identities is equal
+EXACT_MATCH_KEYS: Dict[str, Callable[[Any], Optional[Hashable]]] = {
+    "same_if_same_names": attrgetter("name"),
+    "same_emails_without_domain": attrgetter("normalized_email"),
+}
+
+
+def exact_matches(identities: Sequence[Any]) -> Iterator[Tuple[str, Pair]]:
+    """
+    Match pairs of the exact-match identity heuristics, with the name of the
+    heuristic, in time linear in the number of identities and matches.
+    """
+    for heuristic, key in EXACT_MATCH_KEYS.items():
+        for pair in hash_join(identities, key):
+            yield heuristic, pair
+
+
+class SubstringIndex:
+    """
+    Inverted index from the q-grams of a sequence of texts (None for a missing
+    text) to the positions of the texts containing them. Texts containing a
+    pattern are found by verifying only the texts listed under the rarest q-gram of
+    the pattern; patterns shorter than q are verified against every text.
+
+    >>> index = SubstringIndex(["hlibbabii@gmail.com", None, "hbabii@unibz.it", "babii"])
+    >>> index.containing("babii"), index.containing("unibz"), index.containing("xyz")
+    ([0, 2, 3], [2], [])
+    >>> index.containing("hb"), index.containing_all(("hlib", "babii"))
+    ([2], [0])
+    """
+
+    def __init__(self, texts: Sequence[Optional[str]], q: int = 3):
+        self.texts = texts
+        self.q = q
+        self._present = [i for i, text in enumerate(texts) if text is not None]
+        self._postings: Dict[str, List[int]] = {}
+        for i in self._present:
+            for gram in qgrams(texts[i], q):
+                self._postings.setdefault(gram, []).append(i)
+
+    def _candidates(self, pattern: str) -> List[int]:
+        if len(pattern) < self.q:
+            return self._present
+        postings = [
+            self._postings.get(gram, []) for gram in sorted(qgrams(pattern, self.q))
+        ]
+        return min(postings, key=len)
+
+    def containing(self, pattern: str) -> List[int]:
+        """Positions of the texts containing `pattern`, in increasing order."""
+        texts = self.texts
+        return [i for i in self._candidates(pattern) if pattern in texts[i]]
+
+    def containing_all(self, patterns: Sequence[str]) -> List[int]:
+        """Positions of the texts containing every one of `patterns`."""
+        texts = self.texts
+        return [
+            i
+            for i in self._candidates(max(patterns, key=len))
+            if all(pattern in texts[i] for pattern in patterns)
+        ]
+
+
+NamePatterns = Callable[[NameFeatures], Sequence[Sequence[str]]]
+
+
+def first_and_last_name_patterns(name: NameFeatures) -> Sequence[Sequence[str]]:
+    """`same_if_first_and_last_names_in_email`: both names occur in the email."""
+    if len(name.tokens) >= 2 and len(name.first) > 1 and len(name.last) > 1:
+        return [(name.first, name.last)]
+    return []
+
+
+def partial_first_and_last_name_patterns(
+    name: NameFeatures,
+) -> Sequence[Sequence[str]]:
+    """
+    `same_if_partially_first_and_last_names_in_email`: one name and the initial of
+    the other one occur in the email, in either order.
+    """
+    first, last = name.first, name.last
+    if len(name.tokens) >= 2 and len(first) > 2 and len(last) > 2:
+        return [
+            (first[:1] + last,),
+            (first + last[:1],),
+            (last[:1] + first,),
+            (last + first[:1],),
+        ]
+    return []
+
+
+# heuristics labeling a pair as Match if one of the groups of substrings derived
+# from the name of one identity all occur in the email of the other one
+NAME_IN_EMAIL_PATTERNS: Dict[str, NamePatterns] = {
+    "same_if_first_and_last_names_in_email": first_and_last_name_patterns,
+    "same_if_partially_first_and_last_names_in_email": partial_first_and_last_name_patterns,
+}
+
+
+def name_in_email_pairs(
+    identities: Sequence[Any], patterns: NamePatterns, index: SubstringIndex
+) -> Iterator[Pair]:
+    """
+    Ordered pairs (i, j), i != j, for which the heuristic of `patterns` labels
+    `(identities[i], identities[j])` as Match, found by looking up the patterns of
+    each name in `index`, a `SubstringIndex` over the emails of `identities`.
+
+    The heuristics compare the email of the first identity with the name of the
+    second one and only fall back to the other direction if the first identity
+    has no email or the second one no name, so a pattern of the name of `j` found
+    in the email of `i` labels (i, j), and also (j, i) if `j` has no email or `i`
+    no name.
+    """
+    for j, identity in enumerate(identities):
+        name = name_features(identity.name)
+        if name is None:
+            continue
+        found: Set[int] = set()
+        for group in patterns(name):
+            found.update(index.containing_all(group))
+        found.discard(j)
+        for i in sorted(found):
+            yield i, j
+            if identity.email is None or identities[i].name is None:
+                yield j, i
+
+
+def name_in_email_matches(identities: Sequence[Any]) -> Iterator[Tuple[str, Pair]]:
+    """
+    Match pairs of the name-in-email identity heuristics, with the name of the
+    heuristic, without testing the names of all identities against all emails.
+    Unlike `exact_matches`, the pairs are ordered, since these heuristics are not
+    symmetric.
+    """
+    index = SubstringIndex([identity.email for identity in identities])
+    for heuristic, patterns in NAME_IN_EMAIL_PATTERNS.items():
+        for pair in name_in_email_pairs(identities, patterns, index):
+            yield heuristic, pair
+
+
+class Blocker:
+    """
+    Generates candidate pairs of identities for the pairwise identity heuristics
+    without scoring the full cross product.
+
+    Each blocking key function maps an identity to keys, e.g. its normalized email
+    or the q-grams of its name; identities sharing a key of the same function end up
+    in the same block and every pair within a block is a candidate (for
+    `CrossKeys`, every pair across the two sides of a block). Blocks giving more
+    pairs than a block of `max_block_size` identities (e.g. a q-gram as frequent as
+    "ann") are skipped, trading recall for the quadratic cost of such blocks;
+    `blocking_recall` reports what is lost.
+
+    >>> from types import SimpleNamespace
+    >>> def identity(name=None, email=None):
+    ...     normalized = None if email is None else email.split("@")[0]
+    ...     return SimpleNamespace(name=name, email=email, normalized_email=normalized)
+    >>> identities = [
+    ...     identity("Hlib Babii", "hbabii@gmail.com"),
+    ...     identity(email="hbabii@unibz.it"),
+    ...     identity("hlib babii"),
+    ...     identity("Andrew Smith", "asmith@x.org"),
+    ... ]
+    >>> blocker = Blocker(identities)
+    >>> sorted(blocker.candidates())
+    [(0, 1), (0, 2), (1, 2)]
+    """
+
+    def __init__(
+        self,
+        identities: Sequence[Any],
+        keys: Sequence[BlockingKeys] = IDENTITY_BLOCKING_KEYS,
+        max_block_size: Optional[int] = 1000,
+    ):
+        self.identities = identities
+        self.max_block_size = max_block_size
+        # blocks are (k, key) for key function k, or (k, side, key) for `CrossKeys`
+        self._blocks: Dict[Hashable, List[int]] = {}
+        # for each identity, the blocks of the identities it is paired with
+        self._partners: List[List[Hashable]] = [[] for _ in identities]
+        for k, function in enumerate(keys):
+            if isinstance(function, CrossKeys):
+                sides = [
+                    (function.left, (k, 0), (k, 1)),
+                    (function.right, (k, 1), (k, 0)),
+                ]
+            else:
+                sides = [(function, (k,), (k,))]
+            for side_keys, own, other in sides:
+                for i, identity in enumerate(identities):
+                    for key in set(side_keys(identity)):
+                        self._blocks.setdefault(own + (key,), []).append(i)
+                        self._partners[i].append(other + (key,))
+        self._large: Set[Hashable] = set()
+        if max_block_size is not None:
+            limit = max_block_size * (max_block_size - 1) // 2
+            for block, members in self._blocks.items():
+                if len(block) == 2:
+                    pairs = len(members) * (len(members) - 1) // 2
+                else:
+                    k, side, key = block
+                    pairs = len(members) * len(self._blocks.get((k, 1 - side, key), ()))
+                if pairs > limit:
+                    self._large.add(block)
+
+    def neighbours(self, i: int) -> Set[int]:
+        """Identities sharing a (not too large) block with identity `i`."""
+        result: Set[int] = set()
+        for block in self._partners[i]:
+            if block not in self._large:
+                result.update(self._blocks.get(block, ()))
+        result.discard(i)
+        return result
+
+    def candidates(self) -> Iterator[Pair]:
+        """Candidate pairs (i, j), i < j, each emitted once."""
+        for i in range(len(self.identities)):
+            for j in sorted(self.neighbours(i)):
+                if j > i:
+                    yield i, j
+
+    @property
+    def skipped_blocks(self) -> int:
+        return len(self._large)
+
+
+class BlockingRecall(NamedTuple):
+    pairs: int
+    candidates: int
+    matches: int
+    found: int
+
+    @property
+    def recall(self) -> float:
+        return self.found / self.matches if self.matches else 1.0
+
+    @property
+    def reduction(self) -> float:
+        """Share of the cross product that does not have to be scored."""
+        return 1 - self.candidates / self.pairs if self.pairs else 0.0
+
+
+def blocking_recall(
+    blocker: Blocker, heuristics: Iterable[Callable[[Tuple[Any, Any]], Any]]
+) -> BlockingRecall:
+    """
+    Scores the full cross product of the (sample) identities of `blocker` with
+    `heuristics` and reports how many of the pairs some heuristic labels as
+    Match, in either order, are among the candidates.
+    """
+    heuristics = list(heuristics)
+    identities = blocker.identities
+    candidates = set(blocker.candidates())
+    pairs = matches = found = 0
+    for i, j in combinations(range(len(identities)), 2):
+        pairs += 1
+        first, second = identities[i], identities[j]
+        if any(
+            heuristic((first, second)) == MatchLabel.Match
+            or heuristic((second, first)) == MatchLabel.Match
+            for heuristic in heuristics
+        ):
+            matches += 1
+            found += (i, j) in candidates
+    return BlockingRecall(pairs, len(candidates), matches, found)
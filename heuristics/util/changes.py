@@ -0,0 +1,130 @@
+import re
+from array import array
+from typing import Any, Dict, FrozenSet, Iterator, Tuple
+
+from heuristics.util.memo import LastArtifactCache
+
+KINDS = ("eq", "re", "del", "ins")
+EQ, RE, DEL, INS = range(len(KINDS))
+
+TOKEN_REGEX = re.compile(r"<(eq|re|del|ins)>(.*?)</\1>", flags=re.S)
+DIGITS_REGEX = re.compile(r"\d+")
+
+TO = "<to>"
+
+
+class Changes:
+    """
+    Change markup of a file (`<eq>..</eq>`, `<re>..<to>..</re>`, `<del>..</del>`, ...)
+    as a stream of tokens. For each token only its kind and the offsets of its
+    content in the original string are stored, plus the offset of `<to>` for
+    replacements, so no part of the diff is copied.
+
+    >>> changes = Changes("<eq>version = 4.</eq><re>11<to>12</re><del>TODO</del>")
+    >>> len(changes), [KINDS[kind] for kind in changes.kinds]
+    (3, ['eq', 're', 'del'])
+    >>> changes.has(RE), changes.has(INS)
+    (True, False)
+    >>> [changes.text[start:end] for start, end in changes.spans(DEL)]
+    ['TODO']
+    >>> [(changes.text[start:to], changes.text[to + 4 : end]) for start, to, end in changes.replacements()]
+    [('11', '12')]
+    """
+
+    __slots__ = ("text", "kinds", "starts", "ends", "tos", "present")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.kinds = array("b")
+        self.starts = array("l")
+        self.ends = array("l")
+        self.tos = array("l")
+        for match in TOKEN_REGEX.finditer(text):
+            kind = KINDS.index(match.group(1))
+            start, end = match.span(2)
+            self.kinds.append(kind)
+            self.starts.append(start)
+            self.ends.append(end)
+            self.tos.append(text.find(TO, start, end) if kind == RE else -1)
+        self.present: FrozenSet[int] = frozenset(self.kinds)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def has(self, kind: int) -> bool:
+        return kind in self.present
+
+    def spans(self, kind: int) -> Iterator[Tuple[int, int]]:
+        """Offsets of the contents of the tokens of `kind`."""
+        for i, k in enumerate(self.kinds):
+            if k == kind:
+                yield self.starts[i], self.ends[i]
+
+    def replacements(self) -> Iterator[Tuple[int, int, int]]:
+        """Offsets of the contents of the replacements and of their `<to>`."""
+        for i, k in enumerate(self.kinds):
+            if k == RE and self.tos[i] != -1:
+                yield self.starts[i], self.tos[i], self.ends[i]
+
+    def contains(self, kind: int, substring: str) -> bool:
+        """Whether the content of any token of `kind` contains `substring`."""
+        find = self.text.find
+        return any(find(substring, start, end) != -1 for start, end in self.spans(kind))
+
+    def digit_replacement(self) -> bool:
+        """
+        Whether a number right after a `.` is replaced by another number, as in
+        `<eq>4.</eq><re>11<to>12</re>`, i.e. whether the markup contains a match of
+        `\\.</eq><re>\\d+<to>\\d+</re>`.
+
+        >>> Changes("<eq>4.</eq><re>11<to>12</re>").digit_replacement()
+        True
+        >>> Changes("<eq>version = 4.</eq><re>11<to>12</re><eq>.1</eq>").digit_replacement()
+        True
+        >>> Changes("<eq>4.</eq><re>11<to>12a</re>").digit_replacement()
+        False
+        >>> Changes("<eq>4.</eq><del>1</del><re>11<to>12</re>").digit_replacement()
+        False
+        """
+        text = self.text
+        kinds, starts, ends, tos = self.kinds, self.starts, self.ends, self.tos
+        for i in range(1, len(kinds)):
+            if kinds[i] != RE or kinds[i - 1] != EQ:
+                continue
+            start, to, end = starts[i], tos[i], ends[i]
+            eq_end = ends[i - 1]
+            if (
+                to != -1
+                and eq_end > starts[i - 1]
+                and text[eq_end - 1] == "."
+                and eq_end + len("</eq><re>") == start
+                and DIGITS_REGEX.fullmatch(text, start, to)
+                and DIGITS_REGEX.fullmatch(text, to + len(TO), end)
+            ):
+                return True
+        return False
+
+
+# parsed changes of the files of the current commit, by the id of the file
+_commit_changes: LastArtifactCache[Dict[int, Changes]] = LastArtifactCache(
+    lambda commit: {}
+)
+
+
+def file_changes(commit: Any, file: Any) -> Changes:
+    """
+    Changes of `file` of `commit`, parsed on first use; the heuristics asking for
+    the changes of the same file of the current commit get the same token stream.
+    Only the parses of the current commit are kept.
+
+    >>> from types import SimpleNamespace
+    >>> file = SimpleNamespace(changes="<del>TODO</del>")
+    >>> commit = SimpleNamespace(commit_files=[file])
+    >>> file_changes(commit, file) is file_changes(commit, file)
+    True
+    """
+    parsed = _commit_changes(commit)
+    changes = parsed.get(id(file))
+    if changes is None:
+        changes = parsed[id(file)] = Changes(file.changes)
+    return changes
@@ -0,0 +1,267 @@
+import heapq
+import os
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from bohrlabels.labels import MatchLabel
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+Pair = Tuple[int, int]
+
+
+class IdentityClusters:
+    """
+    Clusters of identities (numbered from 0) kept current while the Match
+    decisions of the identity heuristics are produced, as a union-find forest
+    with union by size and path halving. Memory is two machine integers per
+    identity seen so far, however many decisions are consumed.
+
+    >>> clusters = IdentityClusters()
+    >>> clusters.consume([((0, 1), MatchLabel.Match), ((2, 3), MatchLabel.NoMatch)])
+    >>> clusters.consume([((3, 4), MatchLabel.Match), ((1, 4), None)])
+    >>> clusters.same(0, 1), clusters.same(1, 3), clusters.same(3, 4)
+    (True, False, True)
+    >>> clusters.find(7)
+    7
+    >>> clusters.decisions, clusters.clusters()
+    (4, [[0, 1], [3, 4]])
+    >>> clusters.union(5, 6)
+    True
+    >>> len(clusters), clusters.labels().tolist()
+    (7, [0, 0, 2, 3, 3, 5, 5])
+    """
+
+    def __init__(self, size: int = 0):
+        self._parent = array("q", range(size))
+        self._size = array("q", [1]) * size
+        # identities up to the largest one seen; the arrays may be allocated further
+        self._seen = size
+        # number of decisions consumed, to resume a stream from a checkpoint
+        self.decisions = 0
+
+    def __len__(self) -> int:
+        return self._seen
+
+    def _grow(self, size: int) -> None:
+        if size > len(self._parent):
+            size = max(size, 2 * len(self._parent))
+            self._parent.extend(range(len(self._parent), size))
+            self._size.extend([1] * (size - len(self._size)))
+
+    def find(self, i: int) -> int:
+        """Representative of the cluster of identity `i`."""
+        parent = self._parent
+        if i >= len(parent):
+            return i
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def same(self, i: int, j: int) -> bool:
+        return self.find(i) == self.find(j)
+
+    def union(self, i: int, j: int) -> bool:
+        """Merges the clusters of `i` and `j`; False if they were already one."""
+        self._seen = max(self._seen, i + 1, j + 1)
+        self._grow(self._seen)
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        if self._size[i] < self._size[j]:
+            i, j = j, i
+        self._parent[j] = i
+        self._size[i] += self._size[j]
+        return True
+
+    def consume(
+        self,
+        decisions: Iterable[Tuple[Pair, Any]],
+        checkpoint: Optional[Union[str, Path]] = None,
+        every: int = 1_000_000,
+    ) -> None:
+        """
+        Merges the pairs labeled as Match in a stream of `(pair, label)`
+        decisions, saving a checkpoint every `every` decisions and at the end if
+        `checkpoint` is given. To resume an interrupted run, `load` the checkpoint
+        and skip the first `decisions` items of the stream.
+        """
+        for (i, j), label in decisions:
+            if label == MatchLabel.Match:
+                self.union(i, j)
+            self.decisions += 1
+            if checkpoint is not None and self.decisions % every == 0:
+                self.save(checkpoint)
+        if checkpoint is not None:
+            self.save(checkpoint)
+
+    def labels(self) -> np.ndarray:
+        """Cluster representative of every identity up to the largest one seen."""
+        return np.fromiter(
+            (self.find(i) for i in range(len(self))), dtype=np.int64, count=len(self)
+        )
+
+    def clusters(self) -> List[List[int]]:
+        """Clusters of more than one identity, ordered by their smallest member."""
+        members: Dict[int, List[int]] = {}
+        for i in range(len(self)):
+            members.setdefault(self.find(i), []).append(i)
+        return [cluster for cluster in members.values() if len(cluster) > 1]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Writes a checkpoint, replacing the previous one only once it is complete."""
+        path = Path(path)
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, "wb") as f:
+            np.savez(
+                f,
+                parent=np.frombuffer(self._parent, dtype=np.int64)[: self._seen],
+                size=np.frombuffer(self._size, dtype=np.int64)[: self._seen],
+                decisions=np.int64(self.decisions),
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "IdentityClusters":
+        clusters = cls()
+        with np.load(path) as checkpoint:
+            clusters._parent = array("q", checkpoint["parent"].tobytes())
+            clusters._size = array("q", checkpoint["size"].tobytes())
+            clusters._seen = len(clusters._parent)
+            clusters.decisions = int(checkpoint["decisions"])
+        return clusters
+
+
+EDGE_DTYPE = np.dtype(
+    [("first", np.int64), ("second", np.int64), ("probability", np.float32)]
+)
+
+
+def edge_chunks(
+    path: Union[str, Path], chunk_size: int = 1 << 22
+) -> Iterator[np.ndarray]:
+    """
+    Chunks of the match probabilities of identity pairs stored in a .npy file of
+    `EDGE_DTYPE` records, read through a memory map so that the file is never
+    loaded whole.
+    """
+    edges = np.load(path, mmap_mode="r")
+    if edges.dtype != EDGE_DTYPE:
+        raise ValueError(f"Expected edges of dtype {EDGE_DTYPE}, got {edges.dtype}")
+    for start in range(0, len(edges), chunk_size):
+        yield edges[start : start + chunk_size]
+
+
+def similarity_graph(
+    chunks: Iterable[np.ndarray], threshold: float, size: Optional[int] = None
+) -> csr_matrix:
+    """
+    Symmetric sparse matrix of the probabilities above `threshold` in a stream of
+    `EDGE_DTYPE` chunks; only these edges are ever held in memory. A pair given
+    more than once, e.g. in both orders, gets its largest probability. `size`
+    defaults to one more than the largest identity of a kept edge.
+
+    >>> edges = np.array([(0, 1, 0.9), (1, 0, 0.95), (1, 2, 0.3), (3, 4, 0.8)], dtype=EDGE_DTYPE)
+    >>> graph = similarity_graph([edges[:2], edges[2:]], 0.5)
+    >>> graph.shape, graph.nnz, bool(graph[1, 0] == np.float32(0.95))
+    ((5, 5), 4, True)
+    """
+    firsts, seconds, probabilities = [], [], []
+    for chunk in chunks:
+        kept = chunk[chunk["probability"] > np.float32(threshold)]
+        firsts.append(np.minimum(kept["first"], kept["second"]))
+        seconds.append(np.maximum(kept["first"], kept["second"]))
+        probabilities.append(np.array(kept["probability"]))
+    first = np.concatenate(firsts) if firsts else np.zeros(0, dtype=np.int64)
+    second = np.concatenate(seconds) if seconds else np.zeros(0, dtype=np.int64)
+    probability = (
+        np.concatenate(probabilities) if probabilities else np.zeros(0, np.float32)
+    )
+    loops = first != second
+    first, second, probability = first[loops], second[loops], probability[loops]
+    order = np.lexsort((second, first))
+    first, second, probability = first[order], second[order], probability[order]
+    starts = np.flatnonzero(
+        np.r_[True, (first[1:] != first[:-1]) | (second[1:] != second[:-1])]
+    )
+    first, second = first[starts], second[starts]
+    if len(probability):
+        probability = np.maximum.reduceat(probability, starts)
+    if size is None:
+        size = int(second.max()) + 1 if len(second) else 0
+    return csr_matrix(
+        (np.r_[probability, probability], (np.r_[first, second], np.r_[second, first])),
+        shape=(size, size),
+    )
+
+
+def connected_clusters(graph: csr_matrix) -> np.ndarray:
+    """
+    Cluster number of every identity, clusters being the connected components
+    of the thresholded similarity graph.
+
+    >>> edges = np.array([(0, 1, 0.9), (1, 2, 0.7), (3, 4, 0.8)], dtype=EDGE_DTYPE)
+    >>> connected_clusters(similarity_graph([edges], 0.5)).tolist()
+    [0, 0, 0, 1, 1]
+    """
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def average_linkage(graph: csr_matrix, threshold: float) -> np.ndarray:
+    """
+    Cluster number of every identity after agglomerative clustering with average
+    linkage, merging clusters while their average pairwise probability is above
+    `threshold`. Pairs missing from the sparse graph count as probability 0, so
+    only clusters joined by an edge are ever compared, and each cluster of
+    `connected_clusters` is split further rather than merged with others.
+
+    >>> edges = np.array([(0, 1, 0.9), (1, 2, 0.7), (0, 2, 0.6), (2, 3, 0.6), (4, 5, 0.8)], dtype=EDGE_DTYPE)
+    >>> graph = similarity_graph([edges], 0.5)
+    >>> average_linkage(graph, 0.5).tolist(), connected_clusters(graph).tolist()
+    ([0, 0, 0, 1, 2, 2], [0, 0, 0, 0, 1, 1])
+    """
+    graph = csr_matrix(graph)
+    size = graph.shape[0]
+    # summed probabilities between clusters, keyed by the cluster representatives
+    weights: List[Dict[int, float]] = [{} for _ in range(size)]
+    sizes = [1] * size
+    versions = [0] * size
+    heap = []
+    for i in range(size):
+        for k in range(graph.indptr[i], graph.indptr[i + 1]):
+            j, weight = int(graph.indices[k]), float(graph.data[k])
+            weights[i][j] = weight
+            if i < j and weight > threshold:
+                heap.append((-weight, i, j, 0, 0))
+    heapq.heapify(heap)
+    clusters = IdentityClusters(size)
+    while heap:
+        _, a, b, version_a, version_b = heapq.heappop(heap)
+        if versions[a] != version_a or versions[b] != version_b:
+            continue
+        if len(weights[a]) < len(weights[b]):
+            a, b = b, a
+        clusters.union(a, b)
+        for c, weight in weights[b].items():
+            if c != a:
+                weights[a][c] = weights[a].get(c, 0.0) + weight
+                del weights[c][b]
+        weights[a].pop(b)
+        weights[b] = {}
+        sizes[a] += sizes[b]
+        versions[a] += 1
+        versions[b] = -1
+        for c, weight in weights[a].items():
+            weights[c][a] = weight
+            average = weight / (sizes[a] * sizes[c])
+            if average > threshold:
+                pair = (a, c) if a < c else (c, a)
+                heapq.heappush(
+                    heap, (-average, *pair, versions[pair[0]], versions[pair[1]])
+                )
+    _, labels = np.unique(clusters.labels()[:size], return_inverse=True)
+    return labels
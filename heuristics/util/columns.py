@@ -0,0 +1,83 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, Sequence, Tuple, Type, TypeVar, Union
+
+import numpy as np
+
+C = TypeVar("C", bound="Columns")
+
+
+class Columns:
+    """
+    Features of a whole dataset, one NumPy column per field of the rows computed
+    for each artifact (`FIELDS`, typed by `DTYPES`, int32 by default). Saved as one
+    .npy file per column and loaded memory-mapped, so that heuristics become masks
+    over the columns without deserializing any artifact.
+
+    >>> import tempfile
+    >>> class Sizes(Columns):
+    ...     FIELDS = ("lines", "ratio")
+    ...     DTYPES = {"ratio": np.float32}
+    >>> sizes = Sizes.from_rows([(3, 0.5), (10, 1.0)])
+    >>> len(sizes), sizes.lines.tolist(), sizes.ratio.dtype
+    (2, [3, 10], dtype('float32'))
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     sizes.save(directory)
+    ...     loaded = Sizes.load(directory)
+    ...     loaded.lines.tolist(), type(loaded.ratio).__name__
+    ([3, 10], 'memmap')
+    """
+
+    FIELDS: Tuple[str, ...] = ()
+    DTYPES: Dict[str, Any] = {}
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __getattr__(self, field: str) -> np.ndarray:
+        try:
+            return self.__dict__["columns"][field]
+        except KeyError:
+            raise AttributeError(field) from None
+
+    def __len__(self) -> int:
+        return len(self.columns[self.FIELDS[0]])
+
+    @classmethod
+    def dtype(cls, field: str) -> Any:
+        return cls.DTYPES.get(field, np.int32)
+
+    @classmethod
+    def from_rows(cls: Type[C], rows: Iterable[Sequence[Any]]) -> C:
+        rows = list(rows)
+        return cls(
+            {
+                field: np.fromiter(
+                    (row[i] for row in rows), dtype=cls.dtype(field), count=len(rows)
+                )
+                for i, field in enumerate(cls.FIELDS)
+            }
+        )
+
+    def save(self, directory: Union[str, Path]) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for field in self.FIELDS:
+            column = self.columns[field]
+            stored = np.lib.format.open_memmap(
+                directory / f"{field}.npy",
+                mode="w+",
+                dtype=self.dtype(field),
+                shape=column.shape,
+            )
+            stored[:] = column
+            stored.flush()
+
+    @classmethod
+    def load(cls: Type[C], directory: Union[str, Path]) -> C:
+        directory = Path(directory)
+        return cls(
+            {
+                field: np.load(directory / f"{field}.npy", mmap_mode="r")
+                for field in cls.FIELDS
+            }
+        )
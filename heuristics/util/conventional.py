@@ -0,0 +1,115 @@
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+TYPES = (
+    "build",
+    "chore",
+    "ci",
+    "docs",
+    "feat",
+    "fix",
+    "perf",
+    "refactor",
+    "revert",
+    "style",
+    "test",
+)
+
+# no nested repetition, so matching is linear in the length of the first line and
+# stops right there instead of walking the body of the message
+HEADER_REGEX = re.compile(r"(" + "|".join(TYPES) + r")(?:\((\w+)\))?(!)?: ([^\r\n]+)")
+FOOTER_REGEX = re.compile(r"(BREAKING CHANGE|[\w-]+)(?:: | #)")
+
+LINE_BREAK_REGEX = re.compile(r"\r\n?|\n")
+
+
+class ConventionalHeader(NamedTuple):
+    type: str
+    scope: Optional[str]
+    breaking: bool
+    description: str
+
+
+class ConventionalCommit(NamedTuple):
+    header: ConventionalHeader
+    body: List[str]
+    footers: List[Tuple[str, str]]
+
+    @property
+    def breaking(self) -> bool:
+        return self.header.breaking or any(
+            token in ("BREAKING CHANGE", "BREAKING-CHANGE") for token, _ in self.footers
+        )
+
+
+def parse_header(message: str) -> Optional[ConventionalHeader]:
+    """
+    Parses the header of a conventional commit message, looking only at its first
+    line, or returns None if the message does not start with a conventional header.
+
+    >>> parse_header("feat(lang)!: add polish language\\n\\nsome body")
+    ConventionalHeader(type='feat', scope='lang', breaking=True, description='add polish language')
+    >>> parse_header("fix: correct minor typos in code")
+    ConventionalHeader(type='fix', scope=None, breaking=False, description='correct minor typos in code')
+    >>> parse_header("fix(ünicode): x").scope
+    'ünicode'
+    >>> parse_header("fix: ") is None, parse_header("fix(a b): x") is None, parse_header("Merge branch 'fix'") is None
+    (True, True, True)
+    """
+    match = HEADER_REGEX.match(message)
+    if match is None:
+        return None
+    type, scope, breaking, description = match.groups()
+    return ConventionalHeader(type, scope, breaking is not None, description)
+
+
+def _paragraphs(lines: Iterable[str]) -> Iterator[List[str]]:
+    paragraph: List[str] = []
+    for line in lines:
+        if line:
+            paragraph.append(line)
+        elif paragraph:
+            yield paragraph
+            paragraph = []
+    if paragraph:
+        yield paragraph
+
+
+def _footers(paragraph: List[str]) -> Optional[List[Tuple[str, str]]]:
+    footers: List[Tuple[str, str]] = []
+    for line in paragraph:
+        match = FOOTER_REGEX.match(line)
+        if match is not None:
+            footers.append((match.group(1), line[match.end() :]))
+        elif footers:
+            token, value = footers[-1]
+            footers[-1] = token, value + "\n" + line
+        else:
+            return None
+    return footers
+
+
+def parse(message: str) -> Optional[ConventionalCommit]:
+    """
+    Splits a conventional commit message into its header, body paragraphs and
+    footers in a single pass over its lines.
+
+    >>> commit = parse("fix: correct minor typos\\n\\nsee the issue\\n\\nReviewed-by: Z\\nRefs #133\\n")
+    >>> commit.header.type, commit.body, commit.footers
+    ('fix', ['see the issue'], [('Reviewed-by', 'Z'), ('Refs', '133')])
+    >>> parse("feat: config\\r\\n\\r\\nBREAKING CHANGE: `extends` key\\r\\nis used").breaking
+    True
+    >>> parse("Initial commit") is None
+    True
+    """
+    header = parse_header(message)
+    if header is None:
+        return None
+    lines = iter(LINE_BREAK_REGEX.split(message))
+    next(lines)
+    paragraphs = list(_paragraphs(lines))
+    footers = _footers(paragraphs[-1]) if paragraphs else None
+    if footers is not None:
+        paragraphs.pop()
+    body = ["\n".join(paragraph) for paragraph in paragraphs]
+    return ConventionalCommit(header, body, footers or [])
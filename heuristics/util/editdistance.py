@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import Sequence
+
+import Levenshtein
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein as LevenshteinDistance
+
+
+@lru_cache(maxsize=None)
+def max_distance(max_length: int, ratio: float) -> int:
+    """
+    Largest edit distance `d` for which `(max_length - d) / max_length >= ratio`,
+    evaluated with exactly that float expression, so that thresholding the
+    distance gives the same decisions as computing the relative similarity.
+    Raises ZeroDivisionError for `max_length == 0`, like the expression does.
+
+    >>> max_distance(10, 0.8), max_distance(5, 0.8), max_distance(4, 0.8), max_distance(7, 0.6)
+    (2, 1, 0, 2)
+    """
+    d = int(max_length * (1 - ratio))
+    while d > 0 and not (max_length - d) / max_length >= ratio:
+        d -= 1
+    while d < max_length and (max_length - (d + 1)) / max_length >= ratio:
+        d += 1
+    if d == 0 and not max_length / max_length >= ratio:
+        return -1
+    return d
+
+
+def similar(a: str, b: str, ratio: float) -> bool:
+    """
+    Whether `(L - Levenshtein.distance(a, b)) / L >= ratio` with `L` the length of the
+    longer string, without computing the full distance: pairs whose lengths differ
+    by more than the maximal allowed distance are rejected right away, the others
+    are verified with a distance computation that stops as soon as the bound is
+    exceeded.
+
+    >>> similar("Hlib Babii", "Hlib Babiy", 0.8), similar("Hlib Babii", "Andrew Babii", 0.8)
+    (True, False)
+    >>> similar("", "", 0.8)
+    Traceback (most recent call last):
+    ...
+    ZeroDivisionError: division by zero
+    """
+    len_a, len_b = len(a), len(b)
+    if len_a >= len_b:
+        bound = max_distance(len_a, ratio)
+        if len_a - len_b > bound:
+            return False
+    else:
+        bound = max_distance(len_b, ratio)
+        if len_b - len_a > bound:
+            return False
+    return Levenshtein.distance(a, b, score_cutoff=bound) <= bound
+
+
+def distances(a: Sequence[str], b: Sequence[str]) -> np.ndarray:
+    """
+    Levenshtein distances of the pairs `(a[i], b[i])`, computed in one call into
+    the bit-parallel kernels of rapidfuzz (the backend of `Levenshtein`).
+
+    >>> distances(["Hlib Babii", "Hlib Babii", "", "kitten"], ["Hlib Babiy", "Andrew Babii", "abc", "sitting"]).tolist()
+    [1, 6, 3, 3]
+    """
+    return process.cpdist(a, b, scorer=LevenshteinDistance.distance, workers=-1)
+
+
+def block_distances(strings: Sequence[str]) -> np.ndarray:
+    """
+    Matrix of the Levenshtein distances between all strings of a candidate block.
+    Short strings are compared many at a time with SIMD bit-parallel kernels.
+
+    >>> block_distances(["Hlib Babii", "Hlib Babiy", "Andrew Babii"]).tolist()
+    [[0, 1, 6], [1, 0, 7], [6, 7, 0]]
+    """
+    return process.cdist(
+        strings, strings, scorer=LevenshteinDistance.distance, workers=-1
+    )
+
+
+def similar_many(a: Sequence[str], b: Sequence[str], ratio: float) -> np.ndarray:
+    """
+    `similar` for all pairs `(a[i], b[i])` at once. Raises ZeroDivisionError if
+    both strings of a pair are empty.
+
+    >>> similar_many(["Hlib Babii", "Hlib Babii"], ["Hlib Babiy", "Andrew Babii"], 0.8).tolist()
+    [True, False]
+    """
+    max_length = np.maximum(
+        np.fromiter(map(len, a), dtype=np.int64, count=len(a)),
+        np.fromiter(map(len, b), dtype=np.int64, count=len(b)),
+    )
+    if (max_length == 0).any():
+        raise ZeroDivisionError("division by zero")
+    return (max_length - distances(a, b)) / max_length >= ratio
+
+
+def similar_block(strings: Sequence[str], ratio: float) -> np.ndarray:
+    """
+    `similar` for all pairs of strings of a candidate block, as a boolean matrix.
+
+    >>> similar_block(["Hlib Babii", "Hlib Babiy", "Andrew Babii"], 0.8).astype(int).tolist()
+    [[1, 1, 0], [1, 1, 0], [0, 0, 1]]
+    """
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    max_length = np.maximum(lengths[:, None], lengths[None, :])
+    if (max_length == 0).any():
+        raise ZeroDivisionError("division by zero")
+    return (max_length - block_distances(strings)) / max_length >= ratio
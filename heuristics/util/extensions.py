@@ -0,0 +1,47 @@
+from enum import IntFlag
+from functools import lru_cache
+from typing import Dict
+
+from bohrapi.util.extensiontypes import (
+    code_extensions,
+    doc_text_extensions,
+    passive_code_extensions,
+)
+
+
+class ExtensionClass(IntFlag):
+    OTHER = 0
+    CODE = 1
+    PASSIVE_CODE = 2
+    DOC_TEXT = 4
+
+
+def _extension_table() -> Dict[str, ExtensionClass]:
+    table: Dict[str, ExtensionClass] = {}
+    for extensions, cls in (
+        (code_extensions, ExtensionClass.CODE),
+        (passive_code_extensions, ExtensionClass.PASSIVE_CODE),
+        (doc_text_extensions, ExtensionClass.DOC_TEXT),
+    ):
+        for extension in extensions:
+            table[extension] = table.get(extension, ExtensionClass.OTHER) | cls
+    return table
+
+
+# an extension can belong to more than one class, hence flags
+EXTENSION_CLASSES = _extension_table()
+
+ANY_CODE = ExtensionClass.CODE | ExtensionClass.PASSIVE_CODE
+
+
+def extension(filename: str) -> str:
+    return filename.split(".")[-1]
+
+
+@lru_cache(maxsize=65536)
+def extension_class(filename: str) -> ExtensionClass:
+    """
+    Classes of the extension of `filename`, looked up once per distinct filename,
+    so that frequent names like pom.xml or README.md are classified only once.
+    """
+    return EXTENSION_CLASSES.get(extension(filename), ExtensionClass.OTHER)
@@ -0,0 +1,154 @@
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from heuristics.util.columns import Columns
+from heuristics.util.extensions import ANY_CODE, ExtensionClass, extension_class
+from heuristics.util.memo import LastArtifactCache
+
+
+class FileStats(NamedTuple):
+    """
+    Summary of the files changed by a commit.
+
+    `named` counts the files that have a filename (a missing filename is NaN), `code`
+    and `doc` count those among them with a code (incl. passive code) or a doc text
+    extension.
+    """
+
+    files: int
+    added: int
+    removed: int
+    renamed: int
+    modified: int
+    first_empty: bool
+    changes_length: int
+    named: int
+    code: int
+    doc: int
+
+    @classmethod
+    def of(cls, commit: Any) -> "FileStats":
+        statuses: Dict[Optional[str], int] = {}
+        changes_length = named = code = doc = 0
+        for file in commit.commit_files:
+            statuses[file.status] = statuses.get(file.status, 0) + 1
+            if file.changes:
+                changes_length += len(file.changes)
+            if isinstance(file.filename, float):
+                continue
+            named += 1
+            classes = extension_class(file.filename)
+            code += bool(classes & ANY_CODE)
+            doc += bool(classes & ExtensionClass.DOC_TEXT)
+        files = commit.commit_files
+        return cls(
+            files=len(files),
+            added=statuses.get("added", 0),
+            removed=statuses.get("removed", 0),
+            renamed=statuses.get("renamed", 0),
+            modified=statuses.get("modified", 0),
+            first_empty=len(files) > 0 and files[0].status == "empty",
+            changes_length=changes_length,
+            named=named,
+            code=code,
+            doc=doc,
+        )
+
+
+file_stats = LastArtifactCache(FileStats.of)
+
+
+class FileStatsColumns(Columns):
+    """
+    File statistics of a whole dataset, one NumPy column per field of `FileStats`,
+    so that the file metric heuristics become comparisons over whole columns, e.g.
+    `columns.removed >= 2`, evaluated by `file_metric_labels`.
+
+    >>> from types import SimpleNamespace
+    >>> def commit(*statuses):
+    ...     files = [SimpleNamespace(status=status, changes=None, filename=f"{i}.md") for i, status in enumerate(statuses)]
+    ...     return SimpleNamespace(commit_files=files)
+    >>> columns = FileStatsColumns.from_artifacts([commit("modified"), commit("removed", "removed"), commit()])
+    >>> columns.files.tolist(), columns.removed.tolist()
+    ([1, 2, 0], [0, 2, 0])
+    >>> labels = file_metric_labels(columns)
+    >>> labels["bugless_if_at_least_2_removed_files"].tolist(), labels["no_files_have_modified_status"].tolist()
+    ([False, True, False], [False, True, False])
+    >>> labels["buggless_if_doc_extensions"].tolist() == [bool(only_doc_files(file_stats(c))) for c in [commit("modified"), commit("removed"), commit()]]
+    True
+    """
+
+    FIELDS = FileStats._fields
+    DTYPES = {"first_empty": np.bool_, "changes_length": np.int64}
+
+    @classmethod
+    def from_artifacts(cls, commits: Iterable[Any]) -> "FileStatsColumns":
+        return cls.from_rows(map(FileStats.of, commits))
+
+
+Stats = Union[FileStats, FileStatsColumns]
+
+
+# Conditions of the file metric heuristics. They only use comparisons and `&`, so
+# the same function is applied to the `FileStats` of one commit by the heuristic
+# and to whole `FileStatsColumns` by `file_metric_labels`.
+def one_file(stats: Stats) -> Any:
+    return stats.files == 1
+
+
+def many_files(stats: Stats) -> Any:
+    return stats.files > 15
+
+
+def many_added_files(stats: Stats) -> Any:
+    return stats.added >= 5
+
+
+def many_lines_changed(stats: Stats) -> Any:
+    return stats.changes_length > 16000
+
+
+def many_removed_files(stats: Stats) -> Any:
+    return stats.removed >= 2
+
+
+def many_renamed_files(stats: Stats) -> Any:
+    return stats.renamed >= 2
+
+
+def no_code_files(stats: Stats) -> Any:
+    # files without a filename (NaN) are not counted  TODO needs to be fixed!
+    return (stats.named > 0) & (stats.code == 0)
+
+
+def only_doc_files(stats: Stats) -> Any:
+    # files without a filename (NaN) are not counted  TODO needs to be fixed!
+    return (stats.named > 0) & (stats.named == stats.doc)
+
+
+def no_modified_files(stats: Stats) -> Any:
+    return (stats.files > 0) & np.logical_not(stats.first_empty) & (stats.modified == 0)
+
+
+# the file metric heuristics as masks of the commits they label, with NonBugFix
+# except for `refactoring_if_at_least_2_renamed`, which labels with Refactoring
+FILE_METRIC_MASKS: Dict[str, Callable[[Stats], Any]] = {
+    "buggless_one_file": one_file,
+    "buggless_if_many_lines_changed": many_lines_changed,
+    "bugless_if_at_least_2_removed_files": many_removed_files,
+    "refactoring_if_at_least_2_renamed": many_renamed_files,
+    "bugless_if_not_code_files": no_code_files,
+    "buggless_if_doc_extensions": only_doc_files,
+    "no_files_have_modified_status": no_modified_files,
+    "bugless_if_many_files_changes": many_files,
+    "bugless_if_at_least_5_added_files": many_added_files,
+}
+
+
+def file_metric_labels(columns: FileStatsColumns) -> Dict[str, np.ndarray]:
+    """
+    For each file metric heuristic, the mask of the commits it labels; the
+    heuristic abstains on the other ones.
+    """
+    return {heuristic: mask(columns) for heuristic, mask in FILE_METRIC_MASKS.items()}
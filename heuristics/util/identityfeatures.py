@@ -0,0 +1,45 @@
+from typing import Dict, NamedTuple, Optional, Tuple
+
+MAX_CACHED_NAMES = 1 << 16
+
+
+class NameFeatures(NamedTuple):
+    """
+    Features of an identity name shared by the pair heuristics.
+
+    >>> NameFeatures.of("Hlib Mr Babii")
+    NameFeatures(name='Hlib Mr Babii', tokens=('Hlib', 'Mr', 'Babii'), first='Hlib', last='Babii', initials='HMB')
+    """
+
+    name: str
+    tokens: Tuple[str, ...]
+    first: str
+    last: str
+    initials: str
+
+    @classmethod
+    def of(cls, name: str) -> "NameFeatures":
+        tokens = tuple(name.split(" "))
+        initials = "".join(token[:1] for token in tokens)
+        return cls(name, tokens, tokens[0], tokens[-1], initials)
+
+
+_name_features: Dict[str, NameFeatures] = {}
+
+
+def name_features(name: Optional[str]) -> Optional[NameFeatures]:
+    """
+    Features of `name`, computed once per distinct name however many pairs the
+    identities with this name take part in; None if there is no name.
+
+    >>> name_features("Hlib Babii") is name_features("Hlib Babii"), name_features(None)
+    (True, None)
+    """
+    if name is None:
+        return None
+    features = _name_features.get(name)
+    if features is None:
+        if len(_name_features) >= MAX_CACHED_NAMES:
+            _name_features.clear()
+        features = _name_features[name] = NameFeatures.of(name)
+    return features
@@ -0,0 +1,64 @@
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional
+
+from heuristics.util.ngrams import NgramMatcher
+
+
+def issue_id(issue: Any) -> Optional[Hashable]:
+    raw_data = getattr(issue, "raw_data", None)
+    return raw_data.get("_id") if isinstance(raw_data, dict) else None
+
+
+class IssueIndex:
+    """
+    Stemmed body ngrams and labels of linked issues, keyed by issue id.
+
+    Popular issues are linked from many commits. The index processes the text of
+    each issue once and shares the result between all commits linking to it and
+    all heuristics looking at issues. Issues without an id are not cached.
+
+    >>> from types import SimpleNamespace
+    >>> bug = SimpleNamespace(raw_data={"_id": 1}, ngrams={"crash", "fix"}, stemmed_labels={"bug"})
+    >>> feature = SimpleNamespace(raw_data={"_id": 2}, ngrams={"add"}, stemmed_labels={"featur"})
+    >>> index = IssueIndex()
+    >>> sorted(index.ngrams(SimpleNamespace(issues=[bug, feature])))
+    ['add', 'crash', 'fix']
+    >>> sorted(index.labels(SimpleNamespace(issues=[bug])))
+    ['bug']
+    >>> len(index)
+    2
+    """
+
+    def __init__(self, key: Callable[[Any], Optional[Hashable]] = issue_id):
+        self.key = key
+        self._ngrams: Dict[Hashable, FrozenSet] = {}
+        self._labels: Dict[Hashable, FrozenSet] = {}
+
+    def __len__(self) -> int:
+        return len(self._ngrams.keys() | self._labels.keys())
+
+    def issue_ngrams(self, issue: Any) -> FrozenSet:
+        return self._lookup(self._ngrams, issue, "ngrams")
+
+    def issue_labels(self, issue: Any) -> FrozenSet:
+        return self._lookup(self._labels, issue, "stemmed_labels")
+
+    def ngrams(self, commit: Any) -> FrozenSet:
+        """Union of the body ngrams of all issues linked to `commit`."""
+        return frozenset().union(*map(self.issue_ngrams, commit.issues))
+
+    def labels(self, commit: Any) -> FrozenSet:
+        """Union of the stemmed labels of all issues linked to `commit`."""
+        return frozenset().union(*map(self.issue_labels, commit.issues))
+
+    def _lookup(self, cache: Dict[Hashable, FrozenSet], issue: Any, attr: str):
+        key = self.key(issue)
+        if key is None:
+            return frozenset(getattr(issue, attr))
+        if key not in cache:
+            cache[key] = frozenset(getattr(issue, attr))
+        return cache[key]
+
+
+issue_index = IssueIndex()
+issue_body_ngrams = NgramMatcher(issue_index.ngrams)
+issue_label_ngrams = NgramMatcher(issue_index.labels)
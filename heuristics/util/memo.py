@@ -0,0 +1,33 @@
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LastArtifactCache(Generic[T]):
+    """
+    `function` of the artifact the heuristics are currently applied to, computed
+    once for all of them. Only the last artifact is remembered, compared by
+    identity, since the heuristics are applied to one artifact after another.
+
+    >>> calls = []
+    >>> def length(artifact):
+    ...     calls.append(artifact)
+    ...     return len(artifact)
+    >>> cached_length = LastArtifactCache(length)
+    >>> first, second = ["a"], ["a", "b"]
+    >>> cached_length(first), cached_length(first), cached_length(second)
+    (1, 1, 2)
+    >>> len(calls)
+    2
+    """
+
+    def __init__(self, function: Callable[[Any], T]):
+        self.function = function
+        self._artifact = None
+        self._value: Optional[T] = None
+
+    def __call__(self, artifact: Any) -> T:
+        if artifact is not self._artifact:
+            self._value = self.function(artifact)
+            self._artifact = artifact
+        return self._value
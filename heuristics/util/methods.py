@@ -0,0 +1,208 @@
+import hashlib
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Union
+
+import numpy as np
+
+from heuristics.util.columns import Columns
+from heuristics.util.memo import LastArtifactCache
+from heuristics.util.thresholds import ThresholdFamily
+
+# comments and literals are matched whole so that tokens inside them are skipped
+TOKEN_REGEX = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|;"
+    r"|\b(?:if|for|while|do|case|catch)\b",
+    re.DOTALL,
+)
+BRANCHES = frozenset(["if", "for", "while", "do", "case", "catch"])
+
+# the metrics are only stored on disk if a database is configured
+METHOD_METRICS_CACHE = os.environ.get("BOHR_METHOD_METRICS_CACHE")
+
+
+def method_source(method: Any) -> str:
+    return "\n".join(method.lines)
+
+
+class MethodMetrics(NamedTuple):
+    """
+    Size and nesting metrics of a method. `lines` and `max_depth` are those of the
+    `Method` artifact, the statements and branches are counted in one pass over
+    the tokens of its source.
+
+    >>> from types import SimpleNamespace
+    >>> MethodMetrics.of(SimpleNamespace(max_depth=3, lines=[
+    ...     'void f(int x) {',
+    ...     '    if (x > 0) { // if',
+    ...     '        for (;;) { print("if;"); }',
+    ...     '    }',
+    ...     '}',
+    ... ]))
+    MethodMetrics(lines=5, max_depth=3, statements=3, branches=2)
+    """
+
+    lines: int
+    max_depth: int
+    statements: int
+    branches: int
+
+    @classmethod
+    def of(cls, method: Any) -> "MethodMetrics":
+        statements = branches = 0
+        for match in TOKEN_REGEX.finditer(method_source(method)):
+            token = match.group()
+            if token == ";":
+                statements += 1
+            elif token in BRANCHES:
+                branches += 1
+        return cls(len(method.lines), method.max_depth, statements, branches)
+
+
+class MethodMetricsCache:
+    """
+    Metrics of methods, stored under the hash of the method source in the sqlite
+    database at `path` if one is given, so that running the smell heuristics
+    again over the same methods reads them instead of computing them. The
+    metrics of the method the heuristics are currently applied to are also kept
+    in memory. Each row is committed as it is inserted, and the database is used
+    in WAL mode, waiting up to `timeout` seconds for a lock, so that several
+    processes can share it.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = METHOD_METRICS_CACHE,
+        timeout: float = 60.0,
+    ):
+        self.path = path
+        self.timeout = timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._last = LastArtifactCache(self.lookup)
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections must not be shared with forked worker processes
+        if self._connection is None or self._pid != os.getpid():
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS method_metrics (hash BLOB PRIMARY KEY, "
+                + ", ".join(f"{field} INTEGER" for field in MethodMetrics._fields)
+                + ")"
+            )
+            self._pid = os.getpid()
+        return self._connection
+
+    def lookup(self, method: Any) -> MethodMetrics:
+        if self.path is None:
+            return MethodMetrics.of(method)
+        connection = self._connect()
+        key = hashlib.blake2b(method_source(method).encode(), digest_size=16).digest()
+        row = connection.execute(
+            f"SELECT {', '.join(MethodMetrics._fields)} FROM method_metrics "
+            "WHERE hash = ?",
+            (key,),
+        ).fetchone()
+        if row is not None:
+            return MethodMetrics(*row)
+        metrics = MethodMetrics.of(method)
+        connection.execute(
+            "INSERT OR IGNORE INTO method_metrics VALUES (?"
+            + ", ?" * len(metrics)
+            + ")",
+            (key, *metrics),
+        )
+        return metrics
+
+    def __call__(self, method: Any) -> MethodMetrics:
+        return self._last(method)
+
+
+method_metrics = MethodMetricsCache()
+
+# thresholds of the smell heuristics, shared with their column masks
+LONG_METHOD_LINES = 30
+MANY_INDENTATION_LEVELS = 5
+MANY_INDENTATION_LEVELS2 = 6
+
+
+def method_max_depth(method: Any) -> int:
+    """
+    Nesting depth of `method`, read from the artifact unless the metrics are
+    stored on disk, so that no token pass runs for the indentation heuristics.
+    """
+    if method_metrics.path is None:
+        return method.max_depth
+    return method_metrics(method).max_depth
+
+
+indentation_depth = ThresholdFamily(
+    method_max_depth,
+    [MANY_INDENTATION_LEVELS, MANY_INDENTATION_LEVELS2],
+)
+
+
+class MethodMetricsColumns(Columns):
+    """
+    Metrics of a whole method dataset, one int32 column per field of
+    `MethodMetrics`, so that the smell heuristics are evaluated as masks over the
+    columns by `smell_labels`. The columns are built either from the stored
+    metrics of the methods, without creating any artifact, or from the methods.
+
+    >>> records = [{"lines": 1, "max_depth": 1}, {"lines": 32, "max_depth": 31, "statements": 4}]
+    >>> columns = MethodMetricsColumns.from_records(records)
+    >>> columns.lines.tolist(), columns.max_depth.tolist(), columns.statements.tolist()
+    ([1, 32], [1, 31], [-1, 4])
+    >>> {name: mask.tolist() for name, mask in smell_labels(columns).items()}
+    {'long_method': [False, True], 'many_indentation_levels': [False, True], 'many_indentation_levels2': [False, True]}
+    """
+
+    FIELDS = MethodMetrics._fields
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Mapping[str, int]]
+    ) -> "MethodMetricsColumns":
+        """
+        Columns of metrics already stored per method, e.g. the `lines` and
+        `max_depth` of the raw method documents; a metric missing from a record
+        is stored as -1.
+        """
+        return cls.from_rows(
+            tuple(record.get(field, -1) for field in cls.FIELDS) for record in records
+        )
+
+    @classmethod
+    def from_methods(
+        cls, methods: Iterable[Any], cache: Optional[MethodMetricsCache] = None
+    ) -> "MethodMetricsColumns":
+        """Columns of the metrics of `methods`, read through `cache` if given."""
+        measure = MethodMetrics.of if cache is None else cache.lookup
+        return cls.from_rows(map(measure, methods))
+
+
+# the smell heuristics as masks of the methods they label as smelly
+SMELL_MASKS: Dict[str, Callable[[MethodMetricsColumns], np.ndarray]] = {
+    "long_method": lambda columns: columns.lines > LONG_METHOD_LINES,
+    "many_indentation_levels": (
+        lambda columns: columns.max_depth > MANY_INDENTATION_LEVELS
+    ),
+    "many_indentation_levels2": (
+        lambda columns: columns.max_depth > MANY_INDENTATION_LEVELS2
+    ),
+}
+
+
+def smell_labels(columns: MethodMetricsColumns) -> Dict[str, np.ndarray]:
+    """
+    For each smell heuristic, the mask of the methods it labels with its smell
+    label; the heuristic abstains on the other ones.
+    """
+    return {heuristic: mask(columns) for heuristic, mask in SMELL_MASKS.items()}
@@ -0,0 +1,224 @@
+import ast
+from array import array
+from operator import attrgetter
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+
+from heuristics.util.rawdata import HEURISTICS_ROOT
+
+# matchers of `heuristics.util.ngrams` and the artifact fields they look at
+NGRAM_MATCHERS = {"message_ngrams": "message", "clean_message_ngrams": "clean_message"}
+
+
+class KeywordHeuristic(NamedTuple):
+    """One expansion of a `@KeywordHeuristics` declaration."""
+
+    name: str
+    field: str
+    keywords: FrozenSet[Union[str, tuple]]
+
+
+def ngram(keyword: str) -> Union[str, tuple]:
+    """
+    A keyword as it appears in the stemmed ngrams of a text.
+
+    >>> ngram("fix"), ngram("not work")
+    ('fix', ('not', 'work'))
+    """
+    return tuple(keyword.split(" ")) if " " in keyword else keyword
+
+
+def source_keyword_heuristics(source: str) -> List[KeywordHeuristic]:
+    """
+    Expansions of the `@KeywordHeuristics` declarations in `source` that look
+    their keywords up with one of `NGRAM_MATCHERS`: one per keyword or list of
+    keywords, named by `name_pattern` with `%1` replaced by the (first) keyword.
+
+    >>> heuristics = source_keyword_heuristics('''
+    ... @KeywordHeuristics(Commit, keywords=["bad", ["bug", "bugg"], "not work"], name_pattern="bug_%1")
+    ... def bug(commit, keywords):
+    ...     if message_ngrams.match(commit, keywords):
+    ...         return CommitLabel.BugFix
+    ... ''')
+    >>> [(h.name, h.field, sorted(h.keywords)) for h in heuristics]
+    [('bug_bad', 'message', ['bad']), ('bug_bug', 'message', ['bug', 'bugg']), ('bug_not_work', 'message', [('not', 'work')])]
+    """
+    heuristics = []
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        matchers = {
+            name.id
+            for name in ast.walk(node)
+            if isinstance(name, ast.Name) and name.id in NGRAM_MATCHERS
+        }
+        if len(matchers) != 1:
+            continue
+        (matcher,) = matchers
+        for decorator in node.decorator_list:
+            if (
+                isinstance(decorator, ast.Call)
+                and isinstance(decorator.func, ast.Name)
+                and decorator.func.id == "KeywordHeuristics"
+            ):
+                arguments = {
+                    keyword.arg: ast.literal_eval(keyword.value)
+                    for keyword in decorator.keywords
+                }
+                for keywords in arguments["keywords"]:
+                    if isinstance(keywords, str):
+                        keywords = [keywords]
+                    name = arguments["name_pattern"].replace(
+                        "%1", keywords[0].replace(" ", "_")
+                    )
+                    heuristics.append(
+                        KeywordHeuristic(
+                            name,
+                            NGRAM_MATCHERS[matcher],
+                            frozenset(map(ngram, keywords)),
+                        )
+                    )
+    return heuristics
+
+
+def keyword_heuristics(
+    field: str = "message", root: Path = HEURISTICS_ROOT
+) -> Dict[str, FrozenSet[Union[str, tuple]]]:
+    """
+    Keyword groups of all expanded keyword heuristics under `root` looking at
+    `field`, by heuristic name, collected from their declarations without
+    running any heuristic.
+    """
+    groups: Dict[str, FrozenSet[Union[str, tuple]]] = {}
+    for file in sorted(root.rglob("*.py")):
+        for heuristic in source_keyword_heuristics(file.read_text(encoding="utf-8")):
+            if heuristic.field != field:
+                continue
+            if groups.get(heuristic.name, heuristic.keywords) != heuristic.keywords:
+                raise ValueError(
+                    f"{heuristic.name} is declared with different keywords in {file}"
+                )
+            groups[heuristic.name] = heuristic.keywords
+    return groups
+
+
+class NgramMatrix:
+    """
+    Stemmed ngrams of a whole dataset as a sparse document x ngram matrix.
+
+    Every text is tokenized and stemmed once while the matrix is built. A keyword
+    group is then evaluated for all documents at once as an OR over the columns of
+    its ngrams, so adding keywords does not add any per-commit work.
+
+    >>> from types import SimpleNamespace
+    >>> commits = [
+    ...     SimpleNamespace(message=SimpleNamespace(ngrams={"fix", "typo"})),
+    ...     SimpleNamespace(message=SimpleNamespace(ngrams={"add", "test"})),
+    ...     SimpleNamespace(message=SimpleNamespace(ngrams={"not", "work", ("not", "work")})),
+    ... ]
+    >>> matrix = NgramMatrix.from_artifacts(commits)
+    >>> matrix.shape
+    (3, 7)
+    >>> matrix.match({"bugfix", "fix", "hotfix"}).tolist()
+    [True, False, False]
+    >>> matrix.match({("not", "work")}).tolist()
+    [False, False, True]
+    >>> matrix.match_all([{"fix"}, {"add", "test"}, {"bug"}]).toarray().tolist()
+    [[True, False, False], [False, True, False], [False, False, False]]
+    """
+
+    def __init__(self, matrix: csr_matrix, vocabulary: Dict[Hashable, int]):
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self._by_column = None
+
+    @classmethod
+    def from_artifacts(
+        cls,
+        artifacts: Iterable[Any],
+        field: Callable[[Any], Any] = attrgetter("message"),
+    ) -> "NgramMatrix":
+        vocabulary: Dict[Hashable, int] = {}
+        indices = array("i")
+        indptr = array("q", [0])
+        for artifact in artifacts:
+            for ngram in field(artifact).ngrams:
+                indices.append(vocabulary.setdefault(ngram, len(vocabulary)))
+            indptr.append(len(indices))
+        matrix = csr_matrix(
+            (
+                np.ones(len(indices), dtype=bool),
+                np.frombuffer(indices, dtype=np.int32),
+                np.frombuffer(indptr, dtype=np.int64),
+            ),
+            shape=(len(indptr) - 1, len(vocabulary)),
+        )
+        return cls(matrix, vocabulary)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def columns(self, keywords: Collection) -> Sequence[int]:
+        return [self.vocabulary[kw] for kw in keywords if kw in self.vocabulary]
+
+    def match(self, keywords: Collection) -> np.ndarray:
+        """Boolean column telling which documents contain any of `keywords`."""
+        if self._by_column is None:
+            self._by_column = csc_matrix(self.matrix)
+        result = np.zeros(self.matrix.shape[0], dtype=bool)
+        result[self._by_column[:, self.columns(keywords)].indices] = True
+        return result
+
+    def match_all(self, groups: Sequence[Collection]) -> csr_matrix:
+        """
+        Sparse document x group matrix telling which keyword groups match which
+        documents, computed as a single boolean sparse product.
+        """
+        indices = []
+        indptr = [0]
+        for keywords in groups:
+            indices.extend(self.columns(keywords))
+            indptr.append(len(indices))
+        groups_matrix = csc_matrix(
+            (np.ones(len(indices), dtype=bool), indices, indptr),
+            shape=(len(self.vocabulary), len(groups)),
+        )
+        return self.matrix @ groups_matrix
+
+    def labels(self, groups: Dict[str, Collection]) -> Dict[str, np.ndarray]:
+        """
+        For each heuristic in `groups` (e.g. from `keyword_heuristics`), the boolean
+        column of the documents it labels.
+
+        >>> from types import SimpleNamespace
+        >>> matrix = NgramMatrix.from_artifacts([
+        ...     SimpleNamespace(message=SimpleNamespace(ngrams={"fix", "typo"})),
+        ...     SimpleNamespace(message=SimpleNamespace(ngrams={"add", "test"})),
+        ... ])
+        >>> {name: column.tolist() for name, column in matrix.labels({"bug_fix": {"fix", "hotfix"}, "bug_bad": {"bad"}}).items()}
+        {'bug_fix': [True, False], 'bug_bad': [False, False]}
+        """
+        names = list(groups)
+        matched = csc_matrix(self.match_all([groups[name] for name in names]))
+        result = {}
+        for k, name in enumerate(names):
+            column = np.zeros(self.matrix.shape[0], dtype=bool)
+            column[matched.indices[matched.indptr[k] : matched.indptr[k + 1]]] = True
+            result[name] = column
+        return result
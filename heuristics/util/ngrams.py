@@ -0,0 +1,139 @@
+from operator import attrgetter
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Set,
+)
+
+
+class NgramMatcher:
+    """
+    Looks up the keywords of many heuristics in the same text field of an artifact.
+
+    Every keyword group a heuristic asks for is added to a shared vocabulary. The
+    first lookup for an artifact intersects the stemmed ngrams of its text with the
+    whole vocabulary, all further lookups for the same artifact are answered from
+    that intersection, so the text is matched once no matter how many keyword
+    heuristics look at it. `field` returns either a text exposing its stemmed
+    `ngrams` (and `match_ngrams`), or the ngram set itself.
+
+    The result of each distinct keyword group is computed once per artifact and
+    shared by all heuristics asking for the same group, e.g. the same list in
+    `keywords/` and `keywords_combined/`. Texts that only offer `match_ngrams` are
+    asked about each distinct ngram at most once per artifact, and only about the
+    ngrams some heuristic actually looks up.
+
+    >>> from types import SimpleNamespace
+    >>> matcher = NgramMatcher(attrgetter("message"))
+    >>> commit = SimpleNamespace(message=SimpleNamespace(ngrams={"fix", "null", ("null", "pointer")}))
+    >>> matcher.match(commit, {"bug", "bugg"})
+    False
+    >>> matcher.match(commit, {"nullpointer", "npe", ("null", "pointer")})
+    True
+    >>> matcher.match(commit, ["fix"])
+    True
+    >>> sorted(matcher.fired(commit, {"bug": {"bug", "bugg"}, "fix": {"fix"}, "npe": {"npe", ("null", "pointer")}}))
+    ['fix', 'npe']
+
+    >>> class Message:
+    ...     lookups = []
+    ...     def match_ngrams(self, keywords):
+    ...         self.lookups.extend(keywords)
+    ...         return "fix" in keywords
+    >>> commit = SimpleNamespace(message=Message())
+    >>> matcher.match(commit, {"bug", "bugg"}), matcher.match(commit, ["bugg", "bug"])
+    (False, False)
+    >>> matcher.match(commit, {"bug", "fix"})
+    True
+    >>> sorted(commit.message.lookups)
+    ['bug', 'bugg', 'fix']
+    """
+
+    def __init__(self, field: Callable[[Any], Any]):
+        self.field = field
+        self._groups: Dict[FrozenSet, None] = {}
+        self._vocabulary: Set = set()
+        self._artifact = None
+        self._text = None
+        self._matched: Optional[FrozenSet] = None
+        self._hits: Dict[Hashable, bool] = {}
+        self._results: Dict[FrozenSet, bool] = {}
+
+    def match(self, artifact: Any, keywords: Collection) -> bool:
+        group = keywords if isinstance(keywords, frozenset) else frozenset(keywords)
+        if group not in self._groups:
+            self._groups[group] = None
+            if not self._vocabulary.issuperset(group):
+                self._vocabulary.update(group)
+                self._matched = None
+        self._load(artifact)
+        result = self._results.get(group)
+        if result is None:
+            if self._ngrams() is None:
+                result = any(map(self._hit, group))
+            else:
+                result = not self.matched(artifact).isdisjoint(group)
+            self._results[group] = result
+        return result
+
+    def matched(self, artifact: Any) -> FrozenSet:
+        """Keywords from the vocabulary found in the text of `artifact`."""
+        self._load(artifact)
+        if self._matched is None:
+            ngrams = self._ngrams()
+            if ngrams is None:
+                self._matched = frozenset(filter(self._hit, self._vocabulary))
+            else:
+                self._matched = frozenset(self._vocabulary.intersection(ngrams))
+        return self._matched
+
+    @property
+    def groups(self) -> List[FrozenSet]:
+        """
+        Keyword groups looked up so far, one per expanded heuristic. The groups of
+        all declared keyword heuristics, by name, are given by
+        `heuristics.util.ngrammatrix.keyword_heuristics` without running them.
+        """
+        return list(self._groups)
+
+    def fired(self, artifact: Any, heuristics: Dict[str, Collection]) -> Set[str]:
+        """
+        Names of the keyword `heuristics` (keyword group by heuristic name, e.g.
+        from `heuristics.util.ngrammatrix.keyword_heuristics`) matching
+        `artifact`.
+        """
+        return {
+            name
+            for name, keywords in heuristics.items()
+            if self.match(artifact, keywords)
+        }
+
+    def _load(self, artifact: Any) -> None:
+        if artifact is not self._artifact:
+            self._artifact = artifact
+            self._text = self.field(artifact)
+            self._matched = None
+            self._hits = {}
+            self._results = {}
+
+    def _ngrams(self) -> Optional[AbstractSet]:
+        if isinstance(self._text, AbstractSet):
+            return self._text
+        return getattr(self._text, "ngrams", None)
+
+    def _hit(self, keyword: Hashable) -> bool:
+        hit = self._hits.get(keyword)
+        if hit is None:
+            hit = self._hits[keyword] = self._text.match_ngrams({keyword})
+        return hit
+
+
+message_ngrams = NgramMatcher(attrgetter("message"))
+clean_message_ngrams = NgramMatcher(attrgetter("clean_message"))
@@ -0,0 +1,189 @@
+import importlib
+import pkgutil
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from bohrlabels.labels import MatchLabel
+
+IDENTITY_FIELDS = ("name", "email", "normalized_email")
+
+# position in this tuple is the code of a label in the arrays of `evaluate_pairs`
+LABELS = (MatchLabel.Match, MatchLabel.NoMatch)
+_LABEL_CODES = {label: i for i, label in enumerate(LABELS)}
+NO_LABEL = -1
+
+
+class TableIdentity(NamedTuple):
+    """The attributes of an identity read by the identity heuristics."""
+
+    name: Optional[str]
+    email: Optional[str]
+    normalized_email: Optional[str]
+
+
+class SharedArray(NamedTuple):
+    """What a worker needs to attach to an array in shared memory."""
+
+    name: str
+    dtype: str
+    shape: Tuple[int, ...]
+
+
+def _share(array: np.ndarray, blocks: List[SharedMemory]) -> SharedArray:
+    block = SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return SharedArray(block.name, array.dtype.str, array.shape)
+
+
+def _attach(shared: SharedArray, blocks: List[SharedMemory]) -> np.ndarray:
+    block = SharedMemory(name=shared.name)
+    blocks.append(block)
+    return np.ndarray(shared.shape, dtype=np.dtype(shared.dtype), buffer=block.buf)
+
+
+def pack_strings(
+    strings: Sequence[Optional[str]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    UTF-8 bytes of all `strings` in one buffer, the offsets of each string in it
+    and a mask of the missing ones.
+
+    >>> buffer, offsets, missing = pack_strings(["Hlib", None, "Babii"])
+    >>> buffer.tobytes(), offsets.tolist(), missing.tolist()
+    (b'HlibBabii', [0, 4, 4, 9], [False, True, False])
+    >>> unpack_strings(buffer, offsets, missing)
+    ['Hlib', None, 'Babii']
+    >>> unpack_strings(buffer, offsets, missing, [2, 0])
+    ['Babii', 'Hlib']
+    """
+    encoded = [b"" if string is None else string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    missing = np.fromiter(
+        (string is None for string in strings), dtype=bool, count=len(strings)
+    )
+    return buffer, offsets, missing
+
+
+def unpack_strings(
+    buffer: np.ndarray,
+    offsets: np.ndarray,
+    missing: np.ndarray,
+    indices: Optional[Sequence[int]] = None,
+) -> List[Optional[str]]:
+    """The packed strings at `indices`, all of them by default."""
+    if indices is None:
+        indices = np.arange(len(missing))
+    indices = np.asarray(indices, dtype=np.int64)
+    starts, stops = offsets[indices].tolist(), offsets[indices + 1].tolist()
+    return [
+        None if is_missing else buffer[start:stop].tobytes().decode()
+        for start, stop, is_missing in zip(starts, stops, missing[indices].tolist())
+    ]
+
+
+def identity_heuristic_names() -> List[str]:
+    """Names of the heuristics in `heuristics.identities`, one per module."""
+    import heuristics.identities
+
+    return [
+        module_info.name
+        for module_info in pkgutil.iter_modules(heuristics.identities.__path__)
+    ]
+
+
+def _identity_heuristic(name: str) -> Callable[[Tuple[Any, Any]], Any]:
+    return getattr(importlib.import_module(f"heuristics.identities.{name}"), name)
+
+
+_worker: Dict[str, Any] = {}
+
+
+def _initialize(
+    fields: Dict[str, Tuple[SharedArray, SharedArray, SharedArray]],
+    pairs: SharedArray,
+    heuristics: Sequence[str],
+) -> None:
+    blocks: List[SharedMemory] = []
+    # packed strings are only decoded for the identities of the pairs evaluated
+    _worker["fields"] = [
+        tuple(_attach(shared, blocks) for shared in fields[field])
+        for field in IDENTITY_FIELDS
+    ]
+    _worker["pairs"] = _attach(pairs, blocks)
+    _worker["heuristics"] = [_identity_heuristic(name) for name in heuristics]
+    # views into the blocks must stay valid as long as the worker lives
+    _worker["blocks"] = blocks
+
+
+def _evaluate(bounds: Tuple[int, int]) -> Tuple[int, np.ndarray]:
+    start, stop = bounds
+    heuristics = _worker["heuristics"]
+    pairs = _worker["pairs"][start:stop]
+    indices = np.unique(pairs)
+    columns = [unpack_strings(*field, indices) for field in _worker["fields"]]
+    identities = dict(zip(indices.tolist(), map(TableIdentity._make, zip(*columns))))
+    codes = np.full((len(heuristics), stop - start), NO_LABEL, dtype=np.int8)
+    for k, (i, j) in enumerate(pairs.tolist()):
+        pair = identities[i], identities[j]
+        for h, heuristic in enumerate(heuristics):
+            label = heuristic(pair)
+            if label is not None:
+                codes[h, k] = _LABEL_CODES[label]
+    return start, codes
+
+
+def evaluate_pairs(
+    identities: Sequence[Any],
+    pairs: np.ndarray,
+    heuristics: Optional[Sequence[str]] = None,
+    processes: Optional[int] = None,
+    chunk_size: int = 10_000,
+) -> np.ndarray:
+    """
+    Labels of the candidate `pairs` (an n x 2 array of positions in `identities`)
+    by the identity `heuristics` (module names in `heuristics.identities`, all of
+    them by default), as a heuristics x pairs array of codes of `LABELS`, or
+    `NO_LABEL` if a heuristic abstains.
+
+    The identities are not pickled to the worker processes: their attributes
+    are put in shared memory once, as packed strings, together with the pairs,
+    and each task is only a range of pair positions answered with an int8 array.
+    A worker decodes only the identities the pairs of its range refer to.
+    """
+    if heuristics is None:
+        heuristics = identity_heuristic_names()
+    pairs = np.ascontiguousarray(pairs, dtype=np.int64).reshape(-1, 2)
+    result = np.full((len(heuristics), len(pairs)), NO_LABEL, dtype=np.int8)
+    blocks: List[SharedMemory] = []
+    try:
+        fields = {
+            field: tuple(
+                _share(array, blocks)
+                for array in pack_strings(
+                    [getattr(identity, field) for identity in identities]
+                )
+            )
+            for field in IDENTITY_FIELDS
+        }
+        shared_pairs = _share(pairs, blocks)
+        ranges = [
+            (start, min(start + chunk_size, len(pairs)))
+            for start in range(0, len(pairs), chunk_size)
+        ]
+        with Pool(
+            processes,
+            initializer=_initialize,
+            initargs=(fields, shared_pairs, list(heuristics)),
+        ) as pool:
+            for start, codes in pool.imap_unordered(_evaluate, ranges):
+                result[:, start : start + codes.shape[1]] = codes
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return result
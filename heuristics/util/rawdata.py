@@ -0,0 +1,193 @@
+import ast
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+HEURISTICS_ROOT = Path(__file__).parent.parent
+
+RawDataPath = Tuple[str, ...]
+
+
+class _RawDataVisitor(ast.NodeVisitor):
+    def __init__(self, constants: Dict[str, str]):
+        self.constants = constants
+        self.paths: Set[RawDataPath] = set()
+        # `.raw_data` nodes read through one of the recognised forms
+        self.consumed: Set[ast.AST] = set()
+        # whether `.raw_data` is also read in some other way, e.g. assigned to a
+        # variable, so that any key of the document may be read
+        self.whole_document = False
+
+    def key(self, node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.Index):  # python < 3.9
+            node = node.value
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self.constants.get(node.id)
+        return None
+
+    def path(self, node: ast.AST) -> Optional[RawDataPath]:
+        """Keys of `node` if it is `<expr>.raw_data[k1][k2]...` with constant keys."""
+        if isinstance(node, ast.Attribute) and node.attr == "raw_data":
+            return ()
+        if isinstance(node, ast.Subscript):
+            prefix = self.path(node.value)
+            key = self.key(node.slice)
+            if prefix is not None and key is not None:
+                return prefix + (key,)
+        return None
+
+    def read(self, node: ast.AST, path: RawDataPath) -> None:
+        self.paths.add(path)
+        while isinstance(node, ast.Subscript):
+            node = node.value
+        self.consumed.add(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        path = self.path(node)
+        if path:
+            self.read(node, path)
+        self.generic_visit(node)
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        key = self.key(node.left)
+        for op, comparator in zip(node.ops, node.comparators):
+            path = self.path(comparator)
+            if (
+                isinstance(op, (ast.In, ast.NotIn))
+                and key is not None
+                and path is not None
+            ):
+                self.read(comparator, path + (key,))
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr == "get" and node.args:
+            path = self.path(func.value)
+            key = self.key(node.args[0])
+            if path is not None and key is not None:
+                self.read(func.value, path + (key,))
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if (
+            node.attr == "raw_data"
+            and isinstance(node.ctx, ast.Load)
+            and node not in self.consumed
+        ):
+            self.whole_document = True
+        self.generic_visit(node)
+
+
+def _module_constants(tree: ast.Module) -> Dict[str, str]:
+    constants = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str)
+        ):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = node.value.value
+    return constants
+
+
+def source_raw_data_paths(source: str) -> Optional[Set[RawDataPath]]:
+    """
+    Paths into `raw_data` read by the given source code: constant subscripts,
+    `in` checks and `.get` calls, with module-level string constants resolved.
+    None if `raw_data` is read in any other way, e.g. through a variable or with
+    a computed key, since then any part of the document may be needed.
+
+    >>> sorted(source_raw_data_paths('''
+    ... KEY = "special_commit_finder/0_1"
+    ... def merge(commit):
+    ...     return KEY in commit.raw_data and commit.raw_data[KEY]["merge"]
+    ... def small(commit):
+    ...     return "bohr" in commit.raw_data and commit.raw_data["bohr"].get("gt_512_codeberta_tokens")
+    ... def refactoring(commit):
+    ...     return commit.raw_data["refactoring_miner/2_1_0"]["refactorings"][0]["type"]
+    ... '''))
+    [('bohr',), ('bohr', 'gt_512_codeberta_tokens'), ('refactoring_miner/2_1_0',), ('refactoring_miner/2_1_0', 'refactorings'), ('special_commit_finder/0_1',), ('special_commit_finder/0_1', 'merge')]
+    >>> source_raw_data_paths('''
+    ... def merge(commit):
+    ...     data = commit.raw_data
+    ...     return data["special_commit_finder/0_1"]["merge"]
+    ... ''') is None
+    True
+    """
+    tree = ast.parse(source)
+    visitor = _RawDataVisitor(_module_constants(tree))
+    visitor.visit(tree)
+    return None if visitor.whole_document else visitor.paths
+
+
+def _drop_prefixes(paths: Iterable[RawDataPath]) -> FrozenSet[RawDataPath]:
+    paths = set(paths)
+    prefixes = {path[:i] for path in paths for i in range(1, len(path))}
+    return frozenset(paths - prefixes)
+
+
+def raw_data_paths(root: Path = HEURISTICS_ROOT) -> Optional[FrozenSet[RawDataPath]]:
+    """
+    Paths into `raw_data` read anywhere in the heuristics under `root`, or None if
+    some heuristic needs the whole document. A path is left out if a longer path
+    through it is read, e.g. `bohr` is dropped in favour of
+    `bohr/gt_512_codeberta_tokens`, since the outer key is only checked for
+    presence on the way to the inner one.
+    """
+    paths: Set[RawDataPath] = set()
+    for file in sorted(root.rglob("*.py")):
+        file_paths = source_raw_data_paths(file.read_text(encoding="utf-8"))
+        if file_paths is None:
+            return None
+        paths |= file_paths
+    return _drop_prefixes(paths)
+
+
+def mongo_projection(
+    paths: Optional[Iterable[RawDataPath]], fields: Iterable[str] = ()
+) -> Optional[Dict[str, int]]:
+    """
+    Inclusion projection loading only `paths` of the raw documents, plus the
+    (top-level or dotted) `fields` the artifact classes themselves need; no
+    projection (None) if `paths` is None, i.e. the whole documents are needed.
+
+    >>> mongo_projection([("bohr", "gt_512_codeberta_tokens"), ("mine_sstubs/head",)], ["message"])
+    {'bohr.gt_512_codeberta_tokens': 1, 'message': 1, 'mine_sstubs/head': 1}
+    >>> mongo_projection(None, ["message"]) is None
+    True
+    """
+    if paths is None:
+        return None
+    keys = {".".join(path) for path in paths} | set(fields)
+    return {key: 1 for key in sorted(keys)}
+
+
+def project(
+    document: Dict[str, Any], paths: Optional[Iterable[RawDataPath]]
+) -> Dict[str, Any]:
+    """
+    Copy of `document` containing only `paths`, for documents read from local
+    files; `document` itself if `paths` is None. Values that are not dicts along
+    a path are kept whole.
+
+    >>> project({"message": "x", "bohr": {"a": 1, "b": 2}, "big": [1, 2]}, [("message",), ("bohr", "a"), ("missing", "c")])
+    {'message': 'x', 'bohr': {'a': 1}}
+    """
+    if paths is None:
+        return document
+    result: Dict[str, Any] = {}
+    for path in paths:
+        source, target = document, result
+        for i, key in enumerate(path):
+            if not isinstance(source, dict) or key not in source:
+                break
+            if i == len(path) - 1 or not isinstance(source[key], dict):
+                target[key] = source[key]
+                break
+            source = source[key]
+            target = target.setdefault(key, {})
+    return result
@@ -0,0 +1,108 @@
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+
+from heuristics.util.memo import LastArtifactCache
+
+REFACTORING_MINER = "refactoring_miner/2_1_0"
+
+
+def refactoring_counts(commit: Any) -> Optional[Counter]:
+    """
+    Number of refactorings of each type RefactoringMiner found in `commit`, or None
+    if it has no successful RefactoringMiner output.
+    """
+    if REFACTORING_MINER not in commit.raw_data:
+        return None
+    if not commit.raw_data[REFACTORING_MINER]:
+        return None
+    if commit.raw_data[REFACTORING_MINER]["status"] != "ok":
+        return None
+    return Counter(
+        refactoring["type"]
+        for refactoring in commit.raw_data[REFACTORING_MINER]["refactorings"]
+    )
+
+
+refactorings = LastArtifactCache(refactoring_counts)
+
+
+def only_refactoring(commit: Any, type: str) -> bool:
+    """Whether the only refactoring found in `commit` is of `type`."""
+    counts = refactorings(commit)
+    return counts is not None and counts[type] == 1 and sum(counts.values()) == 1
+
+
+class RefactoringIndex:
+    """
+    Refactoring types found in a whole dataset, as a sparse commit x type matrix
+    of counts plus the total number of refactorings per commit (-1 for commits
+    without a successful RefactoringMiner output). Heuristics over refactoring
+    types become column lookups.
+
+    >>> from types import SimpleNamespace
+    >>> def commit(*types):
+    ...     return SimpleNamespace(raw_data={REFACTORING_MINER: {"status": "ok", "refactorings": [{"type": t} for t in types]}})
+    >>> commits = [commit("Move Class"), commit("Rename Method", "Rename Method", "Move Class"), SimpleNamespace(raw_data={})]
+    >>> index = RefactoringIndex.from_artifacts(commits)
+    >>> index.rows("Move Class").tolist(), index.rows("Extract Method").tolist()
+    ([0, 1], [])
+    >>> index.count("Rename Method").tolist(), index.totals.tolist()
+    ([0, 2, 0], [1, 3, -1])
+    >>> index.only("Move Class").tolist()
+    [True, False, False]
+    """
+
+    def __init__(self, counts: csr_matrix, types: Dict[str, int], totals: np.ndarray):
+        self.counts = counts
+        self.types = types
+        self.totals = totals
+        self._by_type = csc_matrix(counts)
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    @classmethod
+    def from_artifacts(cls, commits: Iterable[Any]) -> "RefactoringIndex":
+        types: Dict[str, int] = {}
+        indices, data = array("i"), array("i")
+        indptr, totals = array("q", [0]), array("i")
+        for commit in commits:
+            counts = refactoring_counts(commit)
+            if counts is None:
+                totals.append(-1)
+            else:
+                totals.append(sum(counts.values()))
+                for type, count in counts.items():
+                    indices.append(types.setdefault(type, len(types)))
+                    data.append(count)
+            indptr.append(len(indices))
+        matrix = csr_matrix(
+            (
+                np.frombuffer(data, dtype=np.int32),
+                np.frombuffer(indices, dtype=np.int32),
+                np.frombuffer(indptr, dtype=np.int64),
+            ),
+            shape=(len(totals), len(types)),
+        )
+        return cls(matrix, types, np.frombuffer(totals, dtype=np.int32))
+
+    def count(self, type: str) -> np.ndarray:
+        """Number of refactorings of `type` in each commit."""
+        if type not in self.types:
+            return np.zeros(len(self), dtype=np.int32)
+        return self._by_type[:, self.types[type]].toarray().ravel()
+
+    def rows(self, type: str) -> np.ndarray:
+        """Commits with at least one refactoring of `type`."""
+        if type not in self.types:
+            return np.zeros(0, dtype=np.int32)
+        column = self._by_type[:, self.types[type]]
+        return np.sort(column.indices)
+
+    def only(self, type: str) -> np.ndarray:
+        """Commits whose only refactoring is of `type`."""
+        return (self.totals == 1) & (self.count(type) == 1)
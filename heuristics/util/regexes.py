@@ -0,0 +1,191 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+# characters some non-ASCII letter matches under re.IGNORECASE without lowering to it
+UNSAFE_IGNORECASE = frozenset("is")
+# number of hex digits following the escapes of a character by its code
+HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+OCTAL_DIGITS = frozenset("01234567")
+
+
+def _escape_end(source: str, i: int) -> int:
+    """
+    Position after the alphanumeric escape `source[i - 1 : i + 1]`, including the
+    digits or name of escapes standing for a character, group or code point.
+    """
+    escaped = source[i]
+    i += 1
+    if escaped in HEX_ESCAPES:
+        return i + HEX_ESCAPES[escaped]
+    if escaped == "N" and source[i : i + 1] == "{":
+        return source.find("}", i) + 1 or len(source)
+    if escaped.isdigit():
+        digits = source[i - 1 : i + 2]
+        if escaped == "0" or (len(digits) == 3 and set(digits) <= OCTAL_DIGITS):
+            # octal escape: \0 and up to two more octal digits, or three octal digits
+            end = i
+            while end < min(i + 2, len(source)) and source[end] in OCTAL_DIGITS:
+                end += 1
+            return end
+        # group reference of one or two digits
+        return i + source[i : i + 1].isdigit()
+    return i
+
+
+def required_literal(pattern: Pattern) -> Optional[str]:
+    """
+    Longest run of plain characters every match of `pattern` contains, lowercased
+    for case-insensitive patterns, or None if no such run is found.
+
+    >>> required_literal(re.compile(r"\\d-SNAPSHOT"))
+    '-SNAPSHOT'
+    >>> required_literal(re.compile(r"\\[maven-release-plugin\\]"))
+    '[maven-release-plugin]'
+    >>> required_literal(re.compile(r"GH(-|\\s)\\d+", flags=re.I))
+    'gh'
+    >>> required_literal(re.compile(r"colou?r"))
+    'colo'
+    >>> required_literal(re.compile(r"fix|bug")) is None
+    True
+    >>> [required_literal(re.compile(p)) for p in (r"\\x41BC", r"\\u0041BC", r"\\U00000041BC", r"\\N{LATIN CAPITAL LETTER A}BC", r"\\0101BC", r"\\101BC", r"(a)\\1BC")]
+    ['BC', 'BC', 'BC', 'BC', '1BC', 'BC', 'BC']
+    """
+    source = pattern.pattern
+    if not isinstance(source, str) or pattern.flags & re.X:
+        return None
+    ignore_case = bool(pattern.flags & re.I)
+    runs: List[str] = []
+    run: List[str] = []
+
+    def end_run(drop_last: bool = False) -> None:
+        if drop_last and run:
+            run.pop()
+        if run:
+            runs.append("".join(run))
+            run.clear()
+
+    depth = 0
+    i = 0
+    while i < len(source):
+        c = source[i]
+        i += 1
+        if c == "\\":
+            escaped = source[i : i + 1]
+            if escaped.isalnum() or not escaped:
+                # classes, anchors and characters given by their code are no literal
+                end_run()
+                i = _escape_end(source, i) if escaped else i + 1
+                continue
+            i += 1
+            c = escaped
+        elif c == "[":
+            end_run()
+            i += source[i : i + 1] == "^"
+            i += source[i : i + 1] == "]"
+            while i < len(source) and source[i] != "]":
+                i += 2 if source[i] == "\\" else 1
+            i += 1
+            continue
+        elif c == "(":
+            end_run()
+            depth += 1
+            continue
+        elif c == ")":
+            depth -= 1
+            continue
+        elif c == "|":
+            if depth == 0:
+                return None
+            continue
+        elif c in "*?{":
+            end_run(drop_last=True)
+            if c == "{":
+                i = source.find("}", i) + 1 or len(source)
+            continue
+        elif c == "+":
+            end_run()
+            continue
+        elif c in ".^$":
+            end_run()
+            continue
+        if depth > 0:
+            continue
+        if ignore_case:
+            if not c.isascii() or c.lower() in UNSAFE_IGNORECASE:
+                end_run()
+                continue
+            c = c.lower()
+        run.append(c)
+    end_run()
+    return max(runs, key=len) if runs else None
+
+
+class RegexSet:
+    """
+    Searches the same text field of an artifact for the patterns of many heuristics.
+
+    The first search for an artifact evaluates all patterns seen so far in one pass
+    and every further search for it is a lookup. Each pattern is screened with a
+    substring check for the literal all of its matches contain, so the regular
+    expression only runs on texts containing that literal. A single alternation of
+    all patterns would be the obvious alternative, but Python's `re` cannot use its
+    literal-prefix scan on alternations, which makes it slower than separate
+    searches.
+
+    >>> from types import SimpleNamespace
+    >>> regexes = RegexSet(lambda commit: commit.message)
+    >>> version, snapshot, rc = re.compile(r"v\\d+\\..*", flags=re.I), re.compile(r"\\d-SNAPSHOT"), re.compile(r"-rc")
+    >>> commit = SimpleNamespace(message="Release V1.2-rc, next is 1.3-SNAPSHOT")
+    >>> regexes.search(commit, version), regexes.search(commit, snapshot), regexes.search(commit, rc)
+    (True, True, True)
+    >>> commit = SimpleNamespace(message="fix typo")
+    >>> regexes.search(commit, version), regexes.search(commit, snapshot), regexes.search(commit, rc)
+    (False, False, False)
+    >>> regexes.matching(SimpleNamespace(message="bump to 2-SNAPSHOT")) == [snapshot]
+    True
+    """
+
+    def __init__(self, field: Callable[[Any], str]):
+        self.field = field
+        self._screens: Dict[Pattern, Tuple[Optional[str], bool]] = {}
+        self._artifact = None
+        self._results: Dict[Pattern, bool] = {}
+
+    def search(self, artifact: Any, pattern: Pattern) -> bool:
+        if artifact is not self._artifact:
+            self._scan(artifact)
+        try:
+            return self._results[pattern]
+        except KeyError:
+            literal = required_literal(pattern)
+            self._screens[pattern] = literal, bool(pattern.flags & re.I)
+            self._scan(artifact)
+            return self._results[pattern]
+
+    def matching(self, artifact: Any) -> List[Pattern]:
+        """Patterns seen so far that are found in `artifact`."""
+        if artifact is not self._artifact:
+            self._scan(artifact)
+        return [pattern for pattern, found in self._results.items() if found]
+
+    def _scan(self, artifact: Any) -> None:
+        text = self.field(artifact)
+        lowered = None
+        results = {}
+        for pattern, (literal, ignore_case) in self._screens.items():
+            if literal is not None:
+                if ignore_case:
+                    if lowered is None:
+                        lowered = text.lower()
+                    if literal not in lowered:
+                        results[pattern] = False
+                        continue
+                elif literal not in text:
+                    results[pattern] = False
+                    continue
+            results[pattern] = pattern.search(text) is not None
+        self._artifact = artifact
+        self._results = results
+
+
+message_regexes = RegexSet(lambda commit: commit.message.raw)
@@ -0,0 +1,84 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class ThresholdFamily:
+    """
+    Variants of a heuristic that compare the same feature of an artifact against
+    different thresholds.
+
+    The feature is extracted once per artifact and located among the sorted
+    thresholds with a binary search. Every variant is then answered by comparing
+    positions, so a family of many thresholds costs about as much as one of its
+    heuristics. Artifacts without the feature (None or NaN) exceed no threshold.
+    A threshold that was not declared is added to the family on first use.
+
+    >>> from types import SimpleNamespace
+    >>> depth = ThresholdFamily(lambda method: method.max_depth, [6, 5, 8])
+    >>> method = SimpleNamespace(max_depth=6)
+    >>> depth.above(method, 5), depth.above(method, 6), depth.at_least(method, 6)
+    (True, False, True)
+    >>> depth.between(method, 5, 6), depth.between(method, 6, 8)
+    (True, False)
+    >>> depth.exceeded(method)
+    [5]
+    >>> depth.exceeded(SimpleNamespace(max_depth=None)), depth.at_least(SimpleNamespace(max_depth=float("nan")), 5)
+    ([], False)
+    >>> depth.above(method, 4), depth.between(method, 4, 7), depth.thresholds
+    (True, True, [4, 5, 6, 7, 8])
+    """
+
+    def __init__(
+        self, feature: Callable[[Any], Optional[float]], thresholds: Iterable[float]
+    ):
+        self.feature = feature
+        self.thresholds: List[float] = sorted(set(thresholds))
+        self._index: Dict[float, int] = {t: i for i, t in enumerate(self.thresholds)}
+        self._artifact = None
+        self._below = 0
+        self._not_above = 0
+
+    def above(self, artifact: Any, threshold: float) -> bool:
+        """feature > threshold"""
+        position = self._position(threshold)
+        self._load(artifact)
+        return position < self._below
+
+    def at_least(self, artifact: Any, threshold: float) -> bool:
+        """feature >= threshold"""
+        position = self._position(threshold)
+        self._load(artifact)
+        return position < self._not_above
+
+    def between(self, artifact: Any, low: float, high: float) -> bool:
+        """low < feature <= high"""
+        low, high = self._position(low), self._position(high)
+        self._load(artifact)
+        return low < self._below <= high
+
+    def exceeded(self, artifact: Any) -> List[float]:
+        """Thresholds the feature of `artifact` is above."""
+        self._load(artifact)
+        return self.thresholds[: self._below]
+
+    def _position(self, threshold: float) -> int:
+        position = self._index.get(threshold)
+        if position is None:
+            insort(self.thresholds, threshold)
+            self._index = {t: i for i, t in enumerate(self.thresholds)}
+            # the positions of the loaded artifact refer to the old thresholds
+            self._artifact = None
+            position = self._index[threshold]
+        return position
+
+    def _load(self, artifact: Any) -> None:
+        if artifact is self._artifact:
+            return
+        value = self.feature(artifact)
+        if value is None or value != value:
+            self._below = self._not_above = 0
+        else:
+            # number of thresholds < value and <= value respectively
+            self._below = bisect_left(self.thresholds, value)
+            self._not_above = bisect_right(self.thresholds, value)
+        self._artifact = artifact
@@ -0,0 +1,196 @@
+from enum import IntFlag
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+from bohrlabels.labels import CommitLabel
+
+from heuristics.util.columns import Columns
+from heuristics.util.memo import LastArtifactCache
+from heuristics.util.thresholds import ThresholdFamily
+
+CHANGE_TRANSFORMER = "change_transformer_label/0_1"
+CODEBERTA_TOKENS = "gt_512_codeberta_tokens"
+SPECIAL_COMMIT_FINDER = "special_commit_finder/0_1"
+SSTUBS = "mine_sstubs/head"
+
+CHANGE_TRANSFORMER_LABELS = {
+    "build": CommitLabel.NonBugFix,
+    "chore": CommitLabel.NonBugFix,
+    "ci": CommitLabel.NonBugFix,
+    "docs": CommitLabel.NonBugFix,
+    "feat": CommitLabel.Feature,
+    "fix": CommitLabel.BugFix,
+    "perf": CommitLabel.NonBugFix,
+    "refactor": CommitLabel.Refactoring,
+    "style": CommitLabel.NonBugFix,
+    "test": CommitLabel.NonBugFix,
+}
+# position in this tuple is the code of a label in `ToolOutputs.label`
+CHANGE_TRANSFORMER_LABEL_NAMES = tuple(CHANGE_TRANSFORMER_LABELS)
+_LABEL_CODES = {name: i for i, name in enumerate(CHANGE_TRANSFORMER_LABEL_NAMES)}
+NO_LABEL = -1
+
+
+class ToolFlag(IntFlag):
+    SSTUB = 1
+    CODEBERTA_TOKENS_KNOWN = 2
+    GT_512_CODEBERTA_TOKENS = 4
+    INITIAL = 8
+    MERGE = 16
+
+
+class ToolOutputs(NamedTuple):
+    """
+    Outputs of external tools stored with a commit, in the form they are stored in
+    `ToolOutputColumns`: the change transformer probability (NaN if missing) and
+    label code (`NO_LABEL` if missing or unknown), and `ToolFlag` bits.
+    """
+
+    probability: float
+    label: int
+    flags: int
+
+    @classmethod
+    def of(cls, commit: Any) -> "ToolOutputs":
+        return cls(
+            *decode_change_transformer_prediction(commit), decode_tool_flags(commit)
+        )
+
+
+def codeberta_flags(commit: Any) -> int:
+    flags = 0
+    if "bohr" in commit.raw_data and CODEBERTA_TOKENS in commit.raw_data["bohr"]:
+        flags |= ToolFlag.CODEBERTA_TOKENS_KNOWN
+        if commit.raw_data["bohr"][CODEBERTA_TOKENS]:
+            flags |= ToolFlag.GT_512_CODEBERTA_TOKENS
+    return flags
+
+
+def sstub_flags(commit: Any) -> int:
+    if SSTUBS in commit.raw_data and commit.raw_data[SSTUBS]:
+        return ToolFlag.SSTUB
+    return 0
+
+
+def special_commit_flags(commit: Any) -> int:
+    flags = 0
+    if SPECIAL_COMMIT_FINDER in commit.raw_data:
+        if (
+            "initial" in commit.raw_data[SPECIAL_COMMIT_FINDER]
+            and commit.raw_data[SPECIAL_COMMIT_FINDER]["initial"]
+        ):
+            flags |= ToolFlag.INITIAL
+        if (
+            "merge" in commit.raw_data[SPECIAL_COMMIT_FINDER]
+            and commit.raw_data[SPECIAL_COMMIT_FINDER]["merge"]
+        ):
+            flags |= ToolFlag.MERGE
+    return flags
+
+
+# the flags of each tool and how they are decoded, each tool's output on its own
+TOOL_FLAGS = {
+    ToolFlag.CODEBERTA_TOKENS_KNOWN
+    | ToolFlag.GT_512_CODEBERTA_TOKENS: LastArtifactCache(codeberta_flags),
+    ToolFlag.SSTUB: LastArtifactCache(sstub_flags),
+    ToolFlag.INITIAL | ToolFlag.MERGE: LastArtifactCache(special_commit_flags),
+}
+
+
+def decode_tool_flags(commit: Any) -> int:
+    """`ToolFlag` bits of `commit`; the change transformer output is not read."""
+    flags = 0
+    for decode in TOOL_FLAGS.values():
+        flags |= decode(commit)
+    return flags
+
+
+def decode_change_transformer_prediction(commit: Any) -> Tuple[float, int]:
+    """
+    Probability and label code of the change transformer output of `commit`, NaN
+    and `NO_LABEL` if there is none.
+    """
+    output = change_transformer_output(commit)
+    if output is None:
+        return float("nan"), NO_LABEL
+    return float(output["probability"]), _LABEL_CODES.get(output["label"], NO_LABEL)
+
+
+# decoded separately from the flags, so that a malformed change transformer output
+# only affects the heuristics reading it
+change_transformer_prediction = LastArtifactCache(decode_change_transformer_prediction)
+
+
+def has_flag(commit: Any, flag: ToolFlag) -> bool:
+    """
+    >>> from types import SimpleNamespace
+    >>> commit = SimpleNamespace(raw_data={"bohr": {CHANGE_TRANSFORMER: {}}, SSTUBS: [{}], SPECIAL_COMMIT_FINDER: None})
+    >>> has_flag(commit, ToolFlag.SSTUB), has_flag(commit, ToolFlag.CODEBERTA_TOKENS_KNOWN)
+    (True, False)
+    >>> has_flag(commit, ToolFlag.MERGE)
+    Traceback (most recent call last):
+    ...
+    TypeError: argument of type 'NoneType' is not iterable
+    >>> change_transformer_prediction(commit)
+    Traceback (most recent call last):
+    ...
+    KeyError: 'probability'
+    """
+    return any(
+        decode(commit) & flag for tool, decode in TOOL_FLAGS.items() if tool & flag
+    )
+
+
+def change_transformer_output(commit: Any) -> Optional[dict]:
+    """Output of the fine-grained change transformer stored with `commit`, if any."""
+    if "bohr" in commit.raw_data and CHANGE_TRANSFORMER in commit.raw_data["bohr"]:
+        return commit.raw_data["bohr"][CHANGE_TRANSFORMER]
+    return None
+
+
+def change_transformer_label(commit: Any) -> CommitLabel:
+    return CHANGE_TRANSFORMER_LABELS[change_transformer_output(commit)["label"]]
+
+
+change_transformer_confidence = ThresholdFamily(
+    lambda commit: change_transformer_prediction(commit)[0], [0.7, 0.8, 0.9]
+)
+
+
+class ToolOutputColumns(Columns):
+    """
+    Tool outputs of a whole dataset as typed columns: float32 probabilities, int8
+    label codes and uint8 flag bits. Saved as one .npy file per column and loaded
+    memory-mapped, so heuristics over tool outputs become masks over the columns,
+    e.g. `columns.flags & ToolFlag.SSTUB != 0`, without deserializing any document.
+    Probabilities are compared with the thresholds at float32 precision.
+
+    >>> from types import SimpleNamespace
+    >>> commits = [
+    ...     SimpleNamespace(raw_data={"bohr": {CHANGE_TRANSFORMER: {"probability": "0.85", "label": "fix"}}}),
+    ...     SimpleNamespace(raw_data={SSTUBS: [{"bugType": "CHANGE_IDENTIFIER"}], SPECIAL_COMMIT_FINDER: {"merge": True}}),
+    ... ]
+    >>> columns = ToolOutputColumns.from_artifacts(commits)
+    >>> columns.between(0.8, 0.9).tolist(), columns.label.tolist()
+    ([True, False], [5, -1])
+    >>> columns.has(ToolFlag.SSTUB).tolist(), columns.has(ToolFlag.MERGE | ToolFlag.INITIAL).tolist()
+    ([False, True], [False, True])
+    """
+
+    FIELDS = ToolOutputs._fields
+    DTYPES = {"probability": np.float32, "label": np.int8, "flags": np.uint8}
+
+    @classmethod
+    def from_artifacts(cls, commits: Iterable[Any]) -> "ToolOutputColumns":
+        return cls.from_rows(map(ToolOutputs.of, commits))
+
+    def has(self, flag: ToolFlag) -> np.ndarray:
+        return (self.flags & flag) != 0
+
+    def above(self, threshold: float) -> np.ndarray:
+        return self.probability > np.float32(threshold)
+
+    def between(self, low: float, high: float) -> np.ndarray:
+        return (self.probability > np.float32(low)) & (
+            self.probability <= np.float32(high)
+        )